@@ -13,6 +13,7 @@ import base64
 import io
 import wave
 import argparse
+import importlib.util
 import shlex
 from pathlib import Path
 from datetime import datetime
@@ -44,13 +45,11 @@ try:
 except ImportError:
     AUDIO_AVAILABLE = False
 
-# Remote client import
-try:
-    from remote_client import RemoteClient
-    import asyncio
-    REMOTE_AVAILABLE = True
-except ImportError:
-    REMOTE_AVAILABLE = False
+# Remote client availability. remote_client (and websockets/PyNaCl with it)
+# is only imported once remote mode is used, keeping local startup fast.
+REMOTE_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None for name in ("websockets", "nacl")
+)
 
 # Command cache import (for semantic command caching)
 try:
@@ -713,8 +712,9 @@ def upload_file(
     if not REMOTE_MODE:
         return "Error: upload_file is only available in remote mode (--remote)"
 
-    if not REMOTE_AVAILABLE or _remote_client is None:
-        return "Error: Remote client not available"
+    session = get_remote_session()
+    if not REMOTE_AVAILABLE or session is None:
+        return "Error: Remote session not available"
 
     # Confirm before upload
     result = confirm_action(
@@ -733,17 +733,9 @@ def upload_file(
         local_path = result.edited_values.get("Local path", local_path)
         remote_path = result.edited_values.get("Remote path", remote_path)
 
-    async def _upload():
-        async with RemoteClient(
-            host="127.0.0.1",
-            port=REMOTE_PORT,
-            private_key=REMOTE_PRIVATE_KEY
-        ) as client:
-            result = await client.upload_file(local_path, remote_path, mode)
-            return result
-
     try:
-        result = asyncio.run(_upload())
+        # Runs on the session's persistent connection and event loop
+        result = session.upload_file(local_path, remote_path, mode)
         if result.success:
             return f"Successfully uploaded {local_path} to {remote_path} ({result.bytes_written} bytes)"
         else:
@@ -774,8 +766,9 @@ def download_file(
     if not REMOTE_MODE:
         return "Error: download_file is only available in remote mode (--remote)"
 
-    if not REMOTE_AVAILABLE or _remote_client is None:
-        return "Error: Remote client not available"
+    session = get_remote_session()
+    if not REMOTE_AVAILABLE or session is None:
+        return "Error: Remote session not available"
 
     # Confirm before download
     result = confirm_action(
@@ -794,17 +787,9 @@ def download_file(
         remote_path = result.edited_values.get("Remote path", remote_path)
         local_path = result.edited_values.get("Local path", local_path)
 
-    async def _download():
-        async with RemoteClient(
-            host="127.0.0.1",
-            port=REMOTE_PORT,
-            private_key=REMOTE_PRIVATE_KEY
-        ) as client:
-            data, result = await client.download_file(remote_path, local_path)
-            return result
-
     try:
-        result = asyncio.run(_download())
+        # Runs on the session's persistent connection and event loop
+        data, result = session.download_file(remote_path, local_path)
         if result.success:
             return f"Successfully downloaded {remote_path} to {local_path} ({result.size} bytes)"
         else:
@@ -2222,7 +2207,7 @@ Provide a brief, helpful response summarizing the result for the user. Be concis
 
 
 def main():
-    global SKIP_PERMISSIONS, REMOTE_MODE, _remote_client
+    global SKIP_PERMISSIONS, REMOTE_MODE
 
     parser = argparse.ArgumentParser(
         description="Natural Language Shell - An intelligent shell powered by LangChain DeepAgents"
@@ -2282,7 +2267,7 @@ def main():
 
         REMOTE_MODE = True
 
-        # Initialize persistent remote session
+        # Initialize persistent remote session (on uvloop if NLSH_USE_UVLOOP=1)
         from remote_client import RemoteSession
         _remote_session = RemoteSession(
             host="127.0.0.1",
@@ -2,31 +2,41 @@
 
 import os
 import sys
-import json
 import asyncio
 import queue
+import socket
 import threading
 import time
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any, Callable, Awaitable
 
 import websockets
 from nacl.signing import SigningKey
 
-# Add shared package to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from shared.asymmetric_crypto import sign_message, load_private_key
+# Add shared package to path (once; skipped when already importable from there)
+_PACKAGES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PACKAGES_DIR not in sys.path:
+    sys.path.insert(0, _PACKAGES_DIR)
+from shared.asymmetric_crypto import (
+    sign_message, sign_message_frame, sign_messages_batch, load_private_key,
+)
+from shared.event_loop import install_uvloop, new_event_loop
+from shared.serialization import (
+    encode_frame, encode_frame_with_body, decode_message, decode_frame, peek_type,
+)
 from shared.protocol import (
     MessageType,
-    CommandRequest, CommandResponse,
-    UploadRequest, UploadResponse,
-    DownloadRequest, DownloadResponse,
+    CommandResponse,
+    UploadRequest, UploadResponse, UploadBeginRequest, UploadChunk,
+    DownloadRequest, DownloadResponse, DownloadChunk,
     ErrorResponse,
     CacheLookupRequest, CacheLookupResponse,
+    CacheLookupBatchRequest, CacheLookupBatchResponse,
     CacheStoreExecRequest,
-    ScriptRequest, ScriptOutputChunk, ScriptCompleteResponse,
+    ScriptRequest, ScriptCompleteResponse,
     ScriptCancelRequest, ScriptCancelledResponse,
     # Server-push message types
     PushTaskStatus, PushJobComplete, PushPrompt, PushNotification,
@@ -34,19 +44,51 @@ from shared.protocol import (
 )
 
 
+# WebSocket write buffer high-water mark (bytes) before send() waits for drain
+WRITE_LIMIT = 1024 * 1024
+
+# Chunk size requested for streamed downloads
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Files at least this large are uploaded in chunks rather than one message
+CHUNKED_UPLOAD_THRESHOLD = 1024 * 1024
+
+# Chunk size for chunked uploads
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# zlib-compress upload/download chunk bodies (helps over slow links with
+# compressible files; costs CPU otherwise, so it is opt-in)
+COMPRESS_TRANSFERS = os.getenv("NLSH_COMPRESS_TRANSFERS", "0") == "1"
+
+# Kernel socket buffer size for the WebSocket connection
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Most requests coalesced into one outgoing frame
+MAX_BATCH_SIZE = 64
+
+# Requests carrying at least this much data are signed in a worker thread
+SIGN_IN_THREAD_SIZE = 16 * 1024
+
+# Script output is handed to on_output at most this often (seconds)...
+OUTPUT_FLUSH_INTERVAL = 0.005
+
+# ...or as soon as this many characters are waiting
+OUTPUT_FLUSH_SIZE = 64 * 1024
+
+
 # ============================================================================
 # Server-Push Message Handling Infrastructure
 # ============================================================================
 
-class PushPriority(Enum):
-    """Priority levels for server-push messages."""
+class PushPriority(IntEnum):
+    """Priority levels for server-push messages (ordered, compare as ints)."""
     LOW = 0
     NORMAL = 1
     HIGH = 2
     CRITICAL = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerPushMessage:
     """Wrapper for server-push messages with metadata."""
     msg_type: str
@@ -67,15 +109,20 @@ class MessageRouter:
     sync handlers (in the main thread via notification queue).
     """
 
-    def __init__(self, notification_queue: "queue.Queue | None" = None):
+    def __init__(self, notification_queue: "queue.SimpleQueue | queue.Queue | None" = None):
         """Initialize the message router.
 
         Args:
             notification_queue: Queue for delivering messages to main thread.
                                If None, sync notifications are disabled.
+                               A queue.SimpleQueue is best: its put() never
+                               blocks the event loop thread. Each entry is
+                               (ServerPushMessage, tuple of sync handlers).
         """
-        self._async_handlers: dict[str, list[PushHandler]] = {}
-        self._sync_handlers: dict[str, list[SyncPushHandler]] = {}
+        # Copy-on-write: registration swaps in a new dict of tuples (under
+        # the lock), so route() can read the current table without locking
+        self._async_handlers: dict[str, tuple[PushHandler, ...]] = {}
+        self._sync_handlers: dict[str, tuple[SyncPushHandler, ...]] = {}
         self._notification_queue = notification_queue
         self._lock = threading.Lock()
 
@@ -89,9 +136,8 @@ class MessageRouter:
             handler: Async function to call with the message payload
         """
         with self._lock:
-            if msg_type not in self._async_handlers:
-                self._async_handlers[msg_type] = []
-            self._async_handlers[msg_type].append(handler)
+            handlers = self._async_handlers
+            self._async_handlers = {**handlers, msg_type: handlers.get(msg_type, ()) + (handler,)}
 
     def register_sync(self, msg_type: str, handler: SyncPushHandler) -> None:
         """Register a sync handler for a message type.
@@ -104,9 +150,8 @@ class MessageRouter:
             handler: Sync function to call with ServerPushMessage
         """
         with self._lock:
-            if msg_type not in self._sync_handlers:
-                self._sync_handlers[msg_type] = []
-            self._sync_handlers[msg_type].append(handler)
+            handlers = self._sync_handlers
+            self._sync_handlers = {**handlers, msg_type: handlers.get(msg_type, ()) + (handler,)}
 
     def unregister(self, msg_type: str, handler: Any) -> bool:
         """Unregister a handler.
@@ -119,18 +164,14 @@ class MessageRouter:
             True if handler was found and removed
         """
         with self._lock:
-            if msg_type in self._async_handlers:
-                try:
-                    self._async_handlers[msg_type].remove(handler)
-                    return True
-                except ValueError:
-                    pass
-            if msg_type in self._sync_handlers:
-                try:
-                    self._sync_handlers[msg_type].remove(handler)
+            for attr in ("_async_handlers", "_sync_handlers"):
+                handlers = getattr(self, attr)
+                current = handlers.get(msg_type, ())
+                if handler in current:
+                    index = current.index(handler)
+                    remaining = current[:index] + current[index + 1:]
+                    setattr(self, attr, {**handlers, msg_type: remaining})
                     return True
-                except ValueError:
-                    pass
         return False
 
     async def route(self, message: dict) -> None:
@@ -145,39 +186,380 @@ class MessageRouter:
         if not msg_type:
             return
 
-        # Create wrapper for sync handlers
-        push_msg = ServerPushMessage(
-            msg_type=msg_type,
-            payload=payload,
-            timestamp=message.get("timestamp", time.time()),
-        )
+        # Handler tables are replaced, never mutated, so no lock is needed
+        async_handlers = self._async_handlers.get(msg_type, ())
+        sync_handlers = self._sync_handlers.get(msg_type, ())
 
-        # Call async handlers
-        with self._lock:
-            async_handlers = list(self._async_handlers.get(msg_type, []))
-            sync_handlers = list(self._sync_handlers.get(msg_type, []))
+        # Call async handlers concurrently; one failing doesn't affect the others
+        if async_handlers:
+            results = await asyncio.gather(
+                *(handler(payload) for handler in async_handlers),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"\033[2m(async handler error for {msg_type}: {result})\033[0m")
+
+        # Queue for sync handlers (called from main thread). The wrapper is
+        # only built when someone will receive it, and one queue entry
+        # carries the message to all of its handlers.
+        if self._notification_queue is not None and sync_handlers:
+            push_msg = ServerPushMessage(
+                msg_type=msg_type,
+                payload=payload,
+                timestamp=message.get("timestamp", time.time()),
+            )
+            self._notification_queue.put_nowait((push_msg, sync_handlers))
+
+
+# ============================================================================
+# Response Dispatch
+# ============================================================================
 
-        for handler in async_handlers:
+# Parser for the successful response to each request type
+_RESPONSE_PARSERS: dict[str, Callable[[dict], Any]] = {
+    MessageType.COMMAND: CommandResponse.from_payload,
+    MessageType.UPLOAD: UploadResponse.from_payload,
+    MessageType.DOWNLOAD: DownloadResponse.from_payload,
+    MessageType.DOWNLOAD_CHUNK: DownloadChunk.from_payload,
+    MessageType.CACHE_LOOKUP: CacheLookupResponse.from_payload,
+    MessageType.CACHE_LOOKUP_BATCH: lambda p: CacheLookupBatchResponse.from_payload(p).results,
+    MessageType.CACHE_STORE_EXEC: CommandResponse.from_payload,
+    MessageType.SCRIPT_CANCEL: ScriptCancelledResponse.from_payload,
+}
+
+# Prefix of the RuntimeError raised when a request of each type fails
+_ERROR_LABELS: dict[str, str] = {
+    MessageType.COMMAND: "Remote error",
+    MessageType.UPLOAD: "Upload failed",
+    MessageType.DOWNLOAD: "Download failed",
+    MessageType.DOWNLOAD_CHUNK: "Download failed",
+    MessageType.CACHE_LOOKUP: "Cache lookup failed",
+    MessageType.CACHE_LOOKUP_BATCH: "Cache lookup failed",
+    MessageType.CACHE_STORE_EXEC: "Cache store/exec failed",
+    MessageType.SCRIPT: "Script execution failed",
+    MessageType.SCRIPT_CANCEL: "Cancel failed",
+}
+
+
+def _raise_if_error(msg_type: str, response: dict[str, Any]) -> None:
+    """Raise RuntimeError if response is an ERROR reply to a msg_type request."""
+    if response["type"] == MessageType.ERROR:
+        error = ErrorResponse.from_payload(response["payload"])
+        raise RuntimeError(f"{_ERROR_LABELS[msg_type]}: {error.error} ({error.code})")
+
+
+def _parse_response(msg_type: str, response: dict[str, Any]) -> Any:
+    """Turn the response to a msg_type request into its protocol object.
+
+    Raises:
+        RuntimeError: If the server replied with an error
+    """
+    _raise_if_error(msg_type, response)
+    return _RESPONSE_PARSERS[msg_type](response["payload"])
+
+
+@lru_cache(maxsize=512)
+def _resolve_dir(directory: str) -> Path:
+    """Resolve symlinks in an absolute directory path (cached)."""
+    return Path(directory).resolve()
+
+
+def _resolve_local_path(path: str | Path) -> Path:
+    """Expand and resolve a local path, reusing resolved parent directories.
+
+    Path.resolve() stats every component; repeated transfers under the same
+    directory only pay for that once.
+    """
+    absolute = os.path.abspath(os.path.expanduser(path))
+    parent, name = os.path.split(absolute)
+    return _resolve_dir(parent) / name
+
+
+def _fail_requests(
+    pending: dict[int, asyncio.Future],
+    streams: dict[int, asyncio.Queue],
+    error: Exception,
+) -> None:
+    """Wake every waiting request in these tables with an error."""
+    for future in pending.values():
+        if not future.done():
+            future.set_exception(error)
+    pending.clear()
+    for stream in streams.values():
+        stream.put_nowait(error)
+
+
+def _tune_socket(websocket) -> None:
+    """Disable Nagle and enlarge kernel buffers on the connection's socket.
+
+    Small RPC frames go out immediately instead of waiting to coalesce,
+    and multi-MB transfers don't stall on the default buffer sizes.
+    Best effort: unsupported options are ignored.
+    """
+    transport = getattr(websocket, "transport", None)
+    sock = transport.get_extra_info("socket") if transport else None
+    if sock is None:
+        return
+    for level, option, value in (
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE),
+    ):
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError:
+            pass
+
+
+def _write_local_file(path: Path, data: bytes) -> None:
+    """Write downloaded data, creating parent directories (runs in a worker thread)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def _open_local_file(path: Path):
+    """Open a download target for writing, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return open(path, "wb")
+
+
+async def _sign_request(
+    private_key: SigningKey,
+    msg_type: str,
+    request: Any,
+    size: int
+) -> dict[str, Any]:
+    """Serialize and sign a protocol request.
+
+    Encoding and signing a large payload takes long enough to stall every
+    other request on the connection, so at SIGN_IN_THREAD_SIZE bytes and
+    up it runs in a worker thread (libsodium and base64 release the GIL).
+
+    Args:
+        private_key: Key to sign with
+        msg_type: Request message type
+        request: Protocol request object (has to_payload())
+        size: Bytes of data the request carries
+    """
+    if size < SIGN_IN_THREAD_SIZE:
+        return sign_message(private_key, msg_type, request.to_payload())
+    return await asyncio.to_thread(
+        lambda: sign_message(private_key, msg_type, request.to_payload())
+    )
+
+
+def _upload_chunk_frame(private_key: SigningKey, rid: int, chunk: UploadChunk) -> bytes:
+    """Sign an upload chunk's header and frame it with the chunk data."""
+    header, body = chunk.to_header_and_body(COMPRESS_TRANSFERS)
+    message = sign_message(private_key, MessageType.UPLOAD_CHUNK, header)
+    message["rid"] = rid
+    return encode_frame_with_body(message, body)
+
+
+async def _send_upload_chunks(
+    private_key: SigningKey,
+    local_path: Path,
+    size: int,
+    rid: int,
+    send: Callable[[bytes | str], Awaitable[None]],
+    stop: asyncio.Future
+) -> None:
+    """Send a file's contents as signed UPLOAD_CHUNK messages.
+
+    Each chunk is one binary frame: the signed header (which carries the
+    data's SHA-256) followed by the raw data, so nothing is base64
+    encoded. The file is read into two reusable buffers: the next chunk
+    is read from disk into one while the chunk in the other is being
+    sent, so memory stays at two chunks. Hashing and signing each chunk
+    happens in a worker thread, off the event loop.
+
+    Args:
+        private_key: Key to sign each chunk with
+        local_path: File to send
+        size: File size announced in UPLOAD_BEGIN
+        rid: The upload's request id
+        send: Coroutine function that sends one encoded frame
+        stop: The upload's response future; sending stops once it is done
+            (the server only answers early to report an error)
+    """
+    buffers = (bytearray(UPLOAD_CHUNK_SIZE), bytearray(UPLOAD_CHUNK_SIZE))
+    current = 0
+    f = await asyncio.to_thread(open, local_path, "rb", buffering=0)
+    try:
+        offset = 0
+        length = await asyncio.to_thread(f.readinto, buffers[current])
+        while not stop.done():
+            eof = not length or offset + length >= size
+            read_ahead = None if eof else asyncio.create_task(
+                asyncio.to_thread(f.readinto, buffers[1 - current])
+            )
             try:
-                await handler(payload)
-            except Exception as e:
-                print(f"\033[2m(async handler error for {msg_type}: {e})\033[0m")
+                data = memoryview(buffers[current])[:length]
+                chunk = UploadChunk(offset=offset, data=data, eof=eof)
+                frame = await asyncio.to_thread(_upload_chunk_frame, private_key, rid, chunk)
+                await send(frame)
+            finally:
+                next_length = await read_ahead if read_ahead else 0
+            if eof:
+                break
+            offset += length
+            length = next_length
+            current = 1 - current
+    finally:
+        f.close()
+
+
+async def _read_download_stream(
+    stream: asyncio.Queue,
+    write: Callable[[bytes], Awaitable[None]],
+    timeout: float
+) -> int:
+    """Consume a download's DOWNLOAD_CHUNK responses from its stream queue.
+
+    Chunk data arrives as raw frame bodies, so there is no base64 to
+    decode. Servers that ignore the binary flag send base64 chunks,
+    which are handled too.
+
+    Args:
+        stream: Queue the receive loop puts the request's responses on
+        write: Coroutine function called with each chunk's data
+        timeout: Seconds to wait for each chunk
+
+    Returns:
+        Total number of bytes received
+
+    Raises:
+        RuntimeError: If the server replied with an error or a chunk
+            arrived out of order
+    """
+    size = 0
+    while True:
+        response = await asyncio.wait_for(stream.get(), timeout=timeout)
+        if isinstance(response, Exception):
+            raise response
+
+        body = response.get("body")
+        if body is None:
+            chunk = _parse_response(MessageType.DOWNLOAD_CHUNK, response)
+        else:
+            _raise_if_error(MessageType.DOWNLOAD_CHUNK, response)
+            chunk = DownloadChunk.from_header_payload(response["payload"], body)
+
+        if chunk.offset != size:
+            raise RuntimeError(
+                f"Download failed: expected offset {size}, got {chunk.offset}"
+            )
+        await write(chunk.data)
+        size += len(chunk.data)
+        if chunk.eof:
+            return size
 
-        # Queue for sync handlers (called from main thread)
-        if self._notification_queue and sync_handlers:
-            for handler in sync_handlers:
-                self._notification_queue.put((push_msg, handler))
+
+async def _download_into_file(
+    download: Callable[[Callable[[bytes], Awaitable[None]]], Awaitable[int]],
+    local_path: Path
+) -> DownloadResponse:
+    """Write each chunk of a streamed download straight to local_path.
+
+    Chunks go to disk as they arrive (in a worker thread), so the file is
+    never held in memory. The file is removed if the download fails.
+
+    Args:
+        download: Coroutine function that streams the file, calling its
+            argument with each chunk and returning the total size
+        local_path: Resolved destination path
+    """
+    f = None
+
+    async def write(data):
+        nonlocal f
+        if f is None:
+            f = await asyncio.to_thread(_open_local_file, local_path)
+        if data:
+            await asyncio.to_thread(f.write, data)
+
+    try:
+        size = await download(write)
+    except BaseException:
+        if f is not None:
+            f.close()
+            local_path.unlink(missing_ok=True)
+        raise
+
+    if f is not None:
+        await asyncio.to_thread(f.close)
+    return DownloadResponse(
+        success=True,
+        data=None,
+        size=size,
+        message=f"Downloaded {size} bytes"
+    )
+
+
+class _CoalescingWriter:
+    """Batches script output into fewer on_output calls.
+
+    Consecutive chunks of the same stream are joined and delivered once
+    OUTPUT_FLUSH_INTERVAL has passed since the first of them arrived, once
+    OUTPUT_FLUSH_SIZE characters are waiting, or when output switches to
+    the other stream (so stdout/stderr interleaving is preserved). A
+    script printing many small lines costs a handful of callbacks, and
+    terminal writes, instead of one per line.
+    """
+
+    __slots__ = ("_on_output", "_stream", "_parts", "_size", "_timer")
+
+    def __init__(self, on_output: Callable[[str, str], None]):
+        self._on_output = on_output
+        self._stream: str | None = None
+        self._parts: list[str] = []
+        self._size = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    def feed(self, stream: str, data: str) -> None:
+        """Buffer one chunk of output."""
+        if stream != self._stream:
+            self.flush()
+            self._stream = stream
+        self._parts.append(data)
+        self._size += len(data)
+        if self._size >= OUTPUT_FLUSH_SIZE:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                OUTPUT_FLUSH_INTERVAL, self.flush
+            )
+
+    def flush(self) -> None:
+        """Deliver whatever is buffered."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._parts:
+            data = "".join(self._parts)
+            self._parts.clear()
+            self._size = 0
+            self._on_output(self._stream, data)
 
 
 class RemoteClient:
-    """Client for connecting to nlsh-remote servers."""
+    """Client for connecting to nlsh-remote servers.
+
+    Requests are multiplexed over a single WebSocket: each outgoing message
+    carries an integer rid (request id), and a background reader task hands
+    every response to the caller waiting on that id. Independent calls can therefore be
+    issued concurrently (e.g. with asyncio.gather).
+    """
 
     def __init__(
         self,
         host: str,
         port: int,
         private_key: SigningKey,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        demux: bool = True,
+        ping_interval: float | None = 20.0
     ):
         """Initialize remote client.
 
@@ -186,49 +568,215 @@ class RemoteClient:
             port: Server port
             private_key: Ed25519 signing key for authentication
             timeout: Connection timeout in seconds
+            demux: Run a background reader that matches responses to requests.
+                   Disable when the owner runs its own receive loop on the socket.
+            ping_interval: Seconds between WebSocket keepalive pings (None disables)
         """
         self.host = host
         self.port = port
         self.private_key = private_key
         self.timeout = timeout
+        self.demux = demux
+        self.ping_interval = ping_interval
         self.ws_url = f"ws://{host}:{port}/ws"
         self._websocket = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        # Pooled clients stay connected across `async with` blocks
+        self._pooled = False
+
+        # Request multiplexing: rid -> waiting future / stream queue
+        self._reader_task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._streams: dict[int, asyncio.Queue] = {}
+        self._rid_counter = 0
 
     async def connect(self) -> bool:
         """Connect to the remote server."""
         try:
+            # Requests and responses travel as binary frames (no UTF-8
+            # validation on either end); lift the 1 MiB frame cap for large downloads and
+            # raise the write buffer so uploads don't stall on backpressure.
+            # permessage-deflate is off: transfers are mostly base64 of
+            # already-compressed data, and zlib per frame dominates CPU.
             ws = await asyncio.wait_for(
-                websockets.connect(self.ws_url),
+                websockets.connect(
+                    self.ws_url,
+                    compression=None,
+                    max_size=None,
+                    write_limit=WRITE_LIMIT,
+                    ping_interval=self.ping_interval
+                ),
                 timeout=self.timeout
             )
             self._websocket = ws  # type: ignore[assignment]
-            return True
+            self._loop = asyncio.get_running_loop()
+            _tune_socket(ws)
         except asyncio.TimeoutError:
             raise ConnectionError(f"Connection timed out: {self.ws_url}")
         except Exception as e:
             raise ConnectionError(f"Failed to connect to {self.ws_url}: {e}")
 
+        if self.demux:
+            # Each connection gets its own request tables, so a reader that
+            # outlives its connection can only fail its own requests
+            self._pending = {}
+            self._streams = {}
+            self._reader_task = asyncio.create_task(
+                self._reader_loop(ws, self._pending, self._streams)
+            )
+        return True
+
     async def disconnect(self):
         """Disconnect from the remote server."""
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+
         if self._websocket:
             await self._websocket.close()
             self._websocket = None
 
+        self._fail_pending(ConnectionError("Disconnected from remote server"))
+
+    async def _reader_loop(
+        self,
+        websocket,
+        pending: dict[int, asyncio.Future],
+        streams: dict[int, asyncio.Queue],
+    ):
+        """Read responses and hand each one to the request that is waiting for it.
+
+        Args:
+            websocket: The connection to read from
+            pending: That connection's waiting requests, by rid
+            streams: That connection's streaming requests, by rid
+        """
+        try:
+            while True:
+                frame = await websocket.recv()
+
+                # Server-push frames have no waiter here; skip them unparsed
+                msg_type = peek_type(frame)
+                if msg_type and msg_type.startswith("push_"):
+                    continue
+
+                response, body = decode_frame(frame)
+                if body is not None:
+                    response["body"] = body
+                rid = response.get("rid")
+
+                # Servers that don't echo rid answer strictly in order
+                if rid is None:
+                    if streams:
+                        rid = next(iter(streams))
+                    elif pending:
+                        rid = next(iter(pending))
+
+                stream = streams.get(rid)
+                if stream is not None:
+                    stream.put_nowait(response)
+                    continue
+
+                future = pending.pop(rid, None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+                # Anything else (late replies) is dropped
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _fail_requests(
+                pending, streams, ConnectionError(f"Connection to remote server lost: {e}")
+            )
+
+    def _fail_pending(self, error: Exception):
+        """Wake every waiting request with an error."""
+        _fail_requests(self._pending, self._streams, error)
+
+    def _next_rid(self) -> int:
+        """Allocate the correlation id for a new request."""
+        rid = self._rid_counter
+        self._rid_counter += 1
+        return rid
+
     async def _send_and_receive(self, message: dict[str, Any]) -> dict[str, Any]:
         """Send a message and wait for response."""
+        rid = self._next_rid()
+        message["rid"] = rid
+        return await self._send_frame_and_receive(rid, encode_frame(message))
+
+    async def _send_frame_and_receive(self, rid: int, frame: bytes) -> dict[str, Any]:
+        """Send an encoded request tagged with rid and wait for its response."""
         if not self._websocket:
             raise ConnectionError("Not connected to remote server")
 
-        await self._websocket.send(json.dumps(message))
-        response_text = await asyncio.wait_for(
-            self._websocket.recv(),
-            timeout=self.timeout
-        )
-        response = json.loads(response_text)
+        if not self._reader_task:
+            await self._websocket.send(frame)
+            response_text = await asyncio.wait_for(
+                self._websocket.recv(),
+                timeout=self.timeout
+            )
+            return decode_message(response_text)
+
+        if self._reader_task.done():
+            raise ConnectionError("Connection to remote server lost")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rid] = future
+
+        try:
+            await self._websocket.send(frame)
+            # In asymmetric mode, server sends unsigned responses over trusted SSH tunnel
+            # No signature verification needed - trust is established via SSH tunnel
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        finally:
+            self._pending.pop(rid, None)
 
-        # In asymmetric mode, server sends unsigned responses over trusted SSH tunnel
-        # No signature verification needed - trust is established via SSH tunnel
-        return response
+    async def _call(self, msg_type: str, payload: dict[str, Any]) -> Any:
+        """Sign and send a request, then parse the response for its type.
+
+        Args:
+            msg_type: Request message type
+            payload: Request payload (a protocol request's to_payload())
+
+        Returns:
+            The parsed response object for msg_type
+
+        Raises:
+            RuntimeError: If the server replied with an error
+        """
+        rid = self._next_rid()
+        frame = sign_message_frame(self.private_key, msg_type, payload, rid)
+        response = await self._send_frame_and_receive(rid, frame)
+        return _parse_response(msg_type, response)
+
+    async def _send_streaming(self, message: dict[str, Any]) -> tuple[int, asyncio.Queue]:
+        """Send a request whose response arrives as several messages.
+
+        Returns:
+            Tuple of (rid, queue); the queue receives each response
+            message (or an exception if the connection drops). The caller
+            must remove rid from self._streams when done.
+        """
+        if not self._websocket:
+            raise ConnectionError("Not connected to remote server")
+        if self._reader_task.done():
+            raise ConnectionError("Connection to remote server lost")
+
+        rid = self._next_rid()
+        message["rid"] = rid
+        stream: asyncio.Queue = asyncio.Queue()
+        self._streams[rid] = stream
+        try:
+            await self._websocket.send(encode_frame(message))
+        except BaseException:
+            self._streams.pop(rid, None)
+            raise
+        return rid, stream
 
     async def execute_command(
         self,
@@ -237,20 +785,9 @@ class RemoteClient:
         timeout: int = 300
     ) -> CommandResponse:
         """Execute a command on the remote server."""
-        request = CommandRequest(command=command, cwd=cwd, timeout=timeout)
-        message = sign_message(
-            self.private_key,
-            MessageType.COMMAND,
-            request.to_payload()
-        )
-
-        response = await self._send_and_receive(message)
-
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Remote error: {error.error} ({error.code})")
-
-        return CommandResponse.from_payload(response["payload"])
+        # Same dict as CommandRequest.to_payload(), built directly on this hot path
+        payload = {"command": command, "cwd": cwd, "timeout": timeout}
+        return await self._call(MessageType.COMMAND, payload)
 
     async def upload_file(
         self,
@@ -259,61 +796,149 @@ class RemoteClient:
         mode: str = "0644"
     ) -> UploadResponse:
         """Upload a file to the remote server."""
-        local_path = Path(local_path).expanduser().resolve()
+        local_path = _resolve_local_path(local_path)
         if not local_path.exists():
             raise FileNotFoundError(f"Local file not found: {local_path}")
         if not local_path.is_file():
             raise ValueError(f"Not a file: {local_path}")
 
-        data = local_path.read_bytes()
-        request = UploadRequest(remote_path=remote_path, data=data, mode=mode)
-        message = sign_message(
-            self.private_key,
-            MessageType.UPLOAD,
-            request.to_payload()
-        )
+        if self._reader_task:
+            size = (await asyncio.to_thread(local_path.stat)).st_size
+            if size >= CHUNKED_UPLOAD_THRESHOLD:
+                return await self._upload_chunked(local_path, remote_path, mode, size)
 
+        # Disk I/O runs in a worker thread so other requests keep flowing
+        data = await asyncio.to_thread(local_path.read_bytes)
+        request = UploadRequest(remote_path=remote_path, data=data, mode=mode)
+        message = await _sign_request(self.private_key, MessageType.UPLOAD, request, len(data))
         response = await self._send_and_receive(message)
+        return _parse_response(MessageType.UPLOAD, response)
 
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Upload failed: {error.error} ({error.code})")
+    async def _upload_chunked(
+        self,
+        local_path: Path,
+        remote_path: str,
+        mode: str,
+        size: int
+    ) -> UploadResponse:
+        """Upload a large file as UPLOAD_BEGIN followed by UPLOAD_CHUNK messages.
 
-        return UploadResponse.from_payload(response["payload"])
+        Only a chunk at a time is held in memory. Sending stops early if
+        the server reports an error.
+        """
+        if self._reader_task.done():
+            raise ConnectionError("Connection to remote server lost")
+
+        rid = self._next_rid()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rid] = future
+
+        try:
+            begin = UploadBeginRequest(remote_path=remote_path, size=size, mode=mode)
+            message = sign_message(self.private_key, MessageType.UPLOAD_BEGIN, begin.to_payload())
+            message["rid"] = rid
+            await self._websocket.send(encode_frame(message))
+            await _send_upload_chunks(
+                self.private_key, local_path, size, rid, self._websocket.send, future
+            )
+
+            response = await asyncio.wait_for(future, timeout=self.timeout)
+        finally:
+            self._pending.pop(rid, None)
+
+        return _parse_response(MessageType.UPLOAD, response)
 
     async def download_file(
         self,
         remote_path: str,
         local_path: str | Path | None = None
     ) -> tuple[bytes, DownloadResponse]:
-        """Download a file from the remote server."""
+        """Download a file from the remote server.
+
+        With a local_path the file is streamed to disk chunk by chunk and
+        the returned data is empty; without one it is returned in memory.
+        """
+        if self._reader_task:
+            if local_path:
+                local_path = _resolve_local_path(local_path)
+                return b"", await _download_into_file(
+                    partial(self._download_chunks, remote_path), local_path
+                )
+            buffer = bytearray()
+
+            async def append(data):
+                buffer.extend(data)
+
+            size = await self._download_chunks(remote_path, append)
+            data = bytes(buffer)
+            return data, DownloadResponse(
+                success=True,
+                data=data,
+                size=size,
+                message=f"Downloaded {size} bytes"
+            )
+
         request = DownloadRequest(remote_path=remote_path)
+        download_response = await self._call(MessageType.DOWNLOAD, request.to_payload())
+
+        if local_path and download_response.data:
+            local_path = _resolve_local_path(local_path)
+            await asyncio.to_thread(_write_local_file, local_path, download_response.data)
+
+        return download_response.data or b"", download_response
+
+    async def _download_chunks(
+        self,
+        remote_path: str,
+        write: Callable[[bytes], Awaitable[None]]
+    ) -> int:
+        """Stream a remote file as binary DOWNLOAD_CHUNK frames.
+
+        Args:
+            remote_path: File to download
+            write: Coroutine function called with each chunk's data
+
+        Returns:
+            Total number of bytes received
+        """
+        request = DownloadRequest(
+            remote_path=remote_path,
+            chunk_size=DOWNLOAD_CHUNK_SIZE,
+            binary=True,
+            compress=COMPRESS_TRANSFERS
+        )
         message = sign_message(
             self.private_key,
             MessageType.DOWNLOAD,
             request.to_payload()
         )
 
-        response = await self._send_and_receive(message)
+        rid, stream = await self._send_streaming(message)
+        try:
+            return await _read_download_stream(stream, write, self.timeout)
+        finally:
+            self._streams.pop(rid, None)
 
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Download failed: {error.error} ({error.code})")
+    async def ping(self) -> bool:
+        """Send a WebSocket ping control frame to check the connection.
 
-        download_response = DownloadResponse.from_payload(response["payload"])
+        The websockets library answers and matches the pong itself, so no
+        message is signed or parsed. Control frames can't carry commands,
+        so they need no signature; application messages still do.
 
-        if local_path and download_response.data:
-            local_path = Path(local_path).expanduser().resolve()
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            local_path.write_bytes(download_response.data)
+        This only proves the connection is alive: it does not check that
+        the server accepts our signed messages. A pong comes back even
+        when authentication is broken (e.g. mismatched keys).
 
-        return download_response.data or b"", download_response
-
-    async def ping(self) -> bool:
-        """Send a ping to check connection."""
-        message = sign_message(self.private_key, MessageType.PING, {"status": "ping"})
-        response = await self._send_and_receive(message)
-        return response["type"] == MessageType.PONG
+        Raises:
+            ConnectionError: If not connected
+            asyncio.TimeoutError: If no pong arrives within the timeout
+        """
+        if not self._websocket:
+            raise ConnectionError("Not connected to remote server")
+        pong_waiter = await self._websocket.ping()
+        await asyncio.wait_for(pong_waiter, timeout=self.timeout)
+        return True
 
     async def cache_lookup(self, key: str) -> CacheLookupResponse:
         """Look up a cached command by key.
@@ -325,19 +950,49 @@ class RemoteClient:
             CacheLookupResponse with hit/miss status and command if found.
         """
         request = CacheLookupRequest(key=key)
-        message = sign_message(
+        return await self._call(MessageType.CACHE_LOOKUP, request.to_payload())
+
+    async def cache_lookup_many(self, keys: list[str]) -> list[CacheLookupResponse]:
+        """Look up several cached commands in one pipelined round trip.
+
+        All requests are signed up front and sent concurrently; responses
+        are matched back by rid.
+
+        Args:
+            keys: UUID keys to look up.
+
+        Returns:
+            CacheLookupResponse for each key, in the same order as keys.
+        """
+        messages = sign_messages_batch(
             self.private_key,
             MessageType.CACHE_LOOKUP,
-            request.to_payload()
+            [CacheLookupRequest(key=key).to_payload() for key in keys]
         )
 
-        response = await self._send_and_receive(message)
+        responses = await asyncio.gather(
+            *(self._send_and_receive(message) for message in messages)
+        )
+
+        return [
+            _parse_response(MessageType.CACHE_LOOKUP, response)
+            for response in responses
+        ]
 
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Cache lookup failed: {error.error} ({error.code})")
+    async def cache_lookup_batch(self, keys: list[str]) -> list[CacheLookupResponse]:
+        """Look up several cached commands with a single signed message.
 
-        return CacheLookupResponse.from_payload(response["payload"])
+        Unlike cache_lookup_many, this costs one signature and one frame
+        each way regardless of the number of keys.
+
+        Args:
+            keys: UUID keys to look up.
+
+        Returns:
+            CacheLookupResponse for each key, in the same order as keys.
+        """
+        request = CacheLookupBatchRequest(keys=keys)
+        return await self._call(MessageType.CACHE_LOOKUP_BATCH, request.to_payload())
 
     async def cache_store_and_execute(
         self,
@@ -363,19 +1018,7 @@ class RemoteClient:
             cwd=cwd,
             timeout=timeout
         )
-        message = sign_message(
-            self.private_key,
-            MessageType.CACHE_STORE_EXEC,
-            request.to_payload()
-        )
-
-        response = await self._send_and_receive(message)
-
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Cache store/exec failed: {error.error} ({error.code})")
-
-        return CommandResponse.from_payload(response["payload"])
+        return await self._call(MessageType.CACHE_STORE_EXEC, request.to_payload())
 
     async def execute_script(
         self,
@@ -419,39 +1062,53 @@ class RemoteClient:
             request.to_payload()
         )
 
-        # Send request
-        await self._websocket.send(json.dumps(message))
-
-        # Receive streaming output until completion
-        stdout_buffer: list[str] = []
-        stderr_buffer: list[str] = []
-
-        while True:
-            response_text = await asyncio.wait_for(
-                self._websocket.recv(),
-                timeout=timeout + 60  # Extra time for completion message
-            )
-            response = json.loads(response_text)
-
-            msg_type = response["type"]
-            payload = response["payload"]
-
-            if msg_type == MessageType.SCRIPT_OUTPUT:
-                chunk = ScriptOutputChunk.from_payload(payload)
-                if chunk.stream == "stdout":
-                    stdout_buffer.append(chunk.data)
-                else:
-                    stderr_buffer.append(chunk.data)
-
-                if on_output:
-                    on_output(chunk.stream, chunk.data)
-
-            elif msg_type == MessageType.SCRIPT_COMPLETE:
-                return ScriptCompleteResponse.from_payload(payload)
-
-            elif msg_type == MessageType.ERROR:
-                error = ErrorResponse.from_payload(payload)
-                raise RuntimeError(f"Script execution failed: {error.error} ({error.code})")
+        # Send request; without the reader task, read the stream directly off the socket
+        if self._reader_task:
+            rid, stream = await self._send_streaming(message)
+        else:
+            await self._websocket.send(encode_frame(message))
+
+        # Receive streaming output until completion. Output is handed to
+        # on_output (batched by the writer) and not retained here.
+        writer = _CoalescingWriter(on_output) if on_output else None
+        # Plain-str locals: comparing against an Enum member costs an
+        # attribute lookup plus a reflected str-subclass __eq__ per frame
+        script_output = MessageType.SCRIPT_OUTPUT.value
+        script_complete = MessageType.SCRIPT_COMPLETE.value
+        error_type = MessageType.ERROR.value
+        try:
+            async with asyncio.timeout(timeout + 60):  # Extra time for completion message
+                while True:
+                    if self._reader_task:
+                        response = await stream.get()
+                        if isinstance(response, Exception):
+                            raise response
+                    else:
+                        response_text = await self._websocket.recv()
+                        # Nobody wants the output: skip its frames unparsed
+                        if not writer and peek_type(response_text) == script_output:
+                            continue
+                        response = decode_message(response_text)
+
+                    msg_type = response["type"]
+                    payload = response["payload"]
+
+                    if msg_type == script_output:
+                        # Hot path: read the two fields straight from the
+                        # payload instead of building a ScriptOutputChunk
+                        if writer:
+                            writer.feed(payload["stream"], payload["data"])
+
+                    elif msg_type == script_complete:
+                        return ScriptCompleteResponse.from_payload(payload)
+
+                    elif msg_type == error_type:
+                        _raise_if_error(MessageType.SCRIPT, response)
+        finally:
+            if writer:
+                writer.flush()
+            if self._reader_task:
+                self._streams.pop(rid, None)
 
     async def cancel_script(
         self,
@@ -468,32 +1125,110 @@ class RemoteClient:
             Cancellation response with partial output
         """
         request = ScriptCancelRequest(script_id=script_id, signal=signal)
-        message = sign_message(
-            self.private_key,
-            MessageType.SCRIPT_CANCEL,
-            request.to_payload()
-        )
-
-        response = await self._send_and_receive(message)
+        return await self._call(MessageType.SCRIPT_CANCEL, request.to_payload())
 
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Cancel failed: {error.error} ({error.code})")
-
-        return ScriptCancelledResponse.from_payload(response["payload"])
+    @property
+    def is_connected(self) -> bool:
+        """Whether the connection is open and usable from the running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if not self._websocket or self._loop is not loop:
+            return False
+        if self._reader_task and self._reader_task.done():
+            return False
+        return True
 
     async def __aenter__(self):
         """Async context manager entry."""
+        if self._pooled and self.is_connected:
+            return self
+        if self._pooled and self._websocket:
+            if self._loop is asyncio.get_running_loop():
+                # Our own connection, but its reader has stopped
+                await self.disconnect()
+            elif self._loop is not None and self._loop.is_running():
+                raise RuntimeError(
+                    "Pooled RemoteClient is in use by an event loop in another thread"
+                )
+            else:
+                self._abandon_connection()
         await self.connect()
         return self
 
+    def _abandon_connection(self) -> None:
+        """Tear down a connection whose event loop has stopped or closed.
+
+        Nothing bound to that loop can be awaited, and transport.abort()
+        would need the loop to run again to finish (a loop closed by
+        asyncio.run() never does), so the socket is shut down directly and
+        the connection ends immediately, without a close handshake.
+        """
+        transport = getattr(self._websocket, "transport", None)
+        sock = transport.get_extra_info("socket") if transport else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._websocket = None
+        self._reader_task = None
+        # Requests on the old loop can never complete; start fresh tables
+        # rather than touching the old ones
+        self._pending = {}
+        self._streams = {}
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        await self.disconnect()
+        """Async context manager exit.
+
+        Pooled clients keep their connection open for the next caller.
+        """
+        if not self._pooled:
+            await self.disconnect()
+
+
+class _ClientPool:
+    """Process-wide pool of RemoteClients keyed by (host, port, key fingerprint, thread).
+
+    Reusing a live client skips the TCP and WebSocket handshakes, which
+    dominate the cost of small RPCs such as cache_lookup. Each thread gets
+    its own clients, so one thread's event loop never takes over a
+    connection another thread's loop is still using.
+    """
+
+    def __init__(self):
+        self._clients: dict[tuple[str, int, str, int], RemoteClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str, port: int, private_key: SigningKey) -> RemoteClient:
+        """Return the calling thread's pooled client for this endpoint and key.
+
+        The client is created on first use.
+        """
+        key = (host, port, bytes(private_key.verify_key).hex(), threading.get_ident())
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = RemoteClient(host=host, port=port, private_key=private_key)
+                client._pooled = True
+                self._clients[key] = client
+            return client
+
+
+_client_pool = _ClientPool()
 
 
 def create_client_from_env() -> RemoteClient:
-    """Create a RemoteClient from environment variables."""
+    """Get a pooled RemoteClient configured from environment variables.
+
+    Repeated calls from the same thread with the same host, port and key
+    return the same client, whose connection stays open between
+    `async with` blocks. The client is shared: use it only through
+    `async with`, and never call disconnect() on it, which would cut off
+    every other user of the connection.
+    """
+    install_uvloop()
     host = os.getenv("NLSH_REMOTE_HOST", "127.0.0.1")
     port = os.getenv("NLSH_REMOTE_PORT", "8765")
     private_key_path = os.getenv("NLSH_PRIVATE_KEY_PATH")
@@ -502,7 +1237,81 @@ def create_client_from_env() -> RemoteClient:
         raise ValueError("NLSH_PRIVATE_KEY_PATH not set")
 
     private_key = load_private_key(private_key_path)
-    return RemoteClient(host=host, port=int(port), private_key=private_key)
+    return _client_pool.get(host, int(port), private_key)
+
+
+# ============================================================================
+# Outbound Batching
+# ============================================================================
+
+class _OutboundBatcher:
+    """Coalesces outgoing requests into as few WebSocket frames as possible.
+
+    Requests queued while a send is in flight go out together in the next
+    frame, as a JSON array the server handles in order. A lone request is
+    sent as a plain message, so an idle connection adds no latency.
+    """
+
+    __slots__ = ("_websocket", "_max_batch", "_queue", "_task")
+
+    def __init__(self, websocket, max_batch: int = MAX_BATCH_SIZE):
+        self._websocket = websocket
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def send(
+        self,
+        message: dict[str, Any] | bytes | str,
+        waiter: asyncio.Future | asyncio.Queue
+    ) -> None:
+        """Queue a message for sending.
+
+        Frames go out as binary, so the server parses the UTF-8 JSON bytes
+        without first validating and decoding them to text.
+
+        Args:
+            message: Signed message, or its encoded JSON (bytes or text)
+            waiter: Where a send error is delivered: the request's response
+                future or stream queue
+        """
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        elif not isinstance(message, bytes):
+            message = encode_frame(message)
+        self._queue.put_nowait((message, waiter))
+
+    def cancel(self) -> None:
+        """Stop sending and fail every request still queued."""
+        self._task.cancel()
+        while not self._queue.empty():
+            _, waiter = self._queue.get_nowait()
+            _fail_waiter(waiter, ConnectionError("Connection closed"))
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            if len(batch) == 1:
+                frame = batch[0][0]
+            else:
+                frame = b"[" + b",".join(message for message, _ in batch) + b"]"
+
+            try:
+                await self._websocket.send(frame)
+            except Exception as e:
+                for _, waiter in batch:
+                    _fail_waiter(waiter, e)
+
+
+def _fail_waiter(waiter: asyncio.Future | asyncio.Queue, error: Exception) -> None:
+    """Deliver a send error to whatever is waiting on the request."""
+    if isinstance(waiter, asyncio.Queue):
+        waiter.put_nowait(error)
+    elif not waiter.done():
+        waiter.set_exception(error)
 
 
 class PersistentRemoteConnection:
@@ -532,34 +1341,51 @@ class PersistentRemoteConnection:
         self.reconnect_delay = reconnect_delay
         self.max_reconnect_attempts = max_reconnect_attempts
 
-        self._client: RemoteClient | None = None
+        # One client for the whole session; reconnects reuse it
+        self._client = RemoteClient(
+            host=host,
+            port=port,
+            private_key=private_key,
+            demux=False
+        )
         self._connected = False
-        self._lock = asyncio.Lock()
         self._ping_task: asyncio.Task | None = None
 
+        # In-flight connect/reconnect, shared by every caller that needs it
+        self._connect_task: asyncio.Task | None = None
+
         # Full duplex: message routing and receive loop
         self._message_router: MessageRouter | None = None
         self._receive_task: asyncio.Task | None = None
-        self._pending_requests: dict[str, asyncio.Future] = {}
-        self._request_id_counter = 0
-        self._pending_lock = asyncio.Lock()
+        self._pending_requests: dict[int, asyncio.Future] = {}
+        self._streams: dict[int, asyncio.Queue] = {}
+        self._rid_counter = 0
+        self._batcher: _OutboundBatcher | None = None
 
     async def connect(self) -> bool:
         """Establish the persistent connection."""
-        async with self._lock:
-            if self._connected and self._client:
-                return True
-
-            self._client = RemoteClient(
-                host=self.host,
-                port=self.port,
-                private_key=self.private_key
-            )
-            await self._client.connect()
-            self._connected = True
-            self._start_ping_loop()
-            self._start_receive_loop()
-            return True
+        if not self._connected:
+            await self._connect_once(self._establish)
+        return True
+
+    async def _connect_once(self, connect: Callable[[], Awaitable[RemoteClient]]) -> RemoteClient:
+        """Run connect unless a connection attempt is already in flight.
+
+        Concurrent callers all wait on the same attempt instead of queueing
+        behind a lock to each try in turn.
+        """
+        if self._connect_task is None or self._connect_task.done():
+            self._connect_task = asyncio.create_task(connect())
+        return await asyncio.shield(self._connect_task)
+
+    async def _establish(self) -> RemoteClient:
+        """Open the connection and start the background tasks."""
+        await self._client.connect()
+        self._connected = True
+        self._start_batcher()
+        self._start_ping_loop()
+        self._start_receive_loop()
+        return self._client
 
     def set_message_router(self, router: MessageRouter) -> None:
         """Set the message router for server-push messages."""
@@ -577,23 +1403,23 @@ class PersistentRemoteConnection:
             self._receive_task.cancel()
         self._receive_task = asyncio.create_task(self._receive_loop())
 
+    def _start_batcher(self):
+        """Start the outbound batcher for the current connection."""
+        if self._batcher:
+            self._batcher.cancel()
+        self._batcher = _OutboundBatcher(self._client._websocket)
+
     async def _ping_loop(self):
-        """Background keepalive task using correlation-based messaging."""
+        """Background keepalive task using WebSocket ping control frames."""
         while self._connected:
             try:
                 await asyncio.sleep(self.ping_interval)
-                if self._client and self._connected and self._client._websocket:
-                    # Send ping through the correlation system
-                    message = sign_message(
-                        self.private_key,
-                        MessageType.PING,
-                        {"status": "ping"}
-                    )
+                if self._connected and self._client._websocket:
+                    # Control-frame ping: no signing, and the pong is matched
+                    # inside websockets rather than by the receive loop
+                    pong_waiter = await self._client._websocket.ping()
                     try:
-                        await asyncio.wait_for(
-                            self._send_and_wait(message, timeout=10.0),
-                            timeout=15.0
-                        )
+                        await asyncio.wait_for(pong_waiter, timeout=10.0)
                     except asyncio.TimeoutError:
                         # Ping timeout - connection may be dead
                         self._connected = False
@@ -610,61 +1436,36 @@ class PersistentRemoteConnection:
         This loop handles both:
         1. Responses to client-initiated requests (correlation-based)
         2. Server-push messages (routed to handlers)
+
+        It blocks in recv() until a message arrives and runs until the
+        connection closes or disconnect()/reconnect cancels it. A frame
+        may carry a JSON array of messages; each is dispatched in order.
         """
-        while self._connected:
+        websocket = self._client._websocket
+        while True:
             try:
-                if not self._client or not self._client._websocket:
-                    await asyncio.sleep(0.1)
-                    continue
-
-                # Receive message with timeout to allow checking _connected
-                try:
-                    response_text = await asyncio.wait_for(
-                        self._client._websocket.recv(),
-                        timeout=1.0  # Short timeout for responsiveness
-                    )
-                except asyncio.TimeoutError:
-                    continue  # Check _connected and retry
-
-                message = json.loads(response_text)
-                msg_type = message.get("type")
-
-                # Check if this is a response to a pending request
-                request_id = message.get("request_id")
-                if request_id and request_id in self._pending_requests:
-                    # Complete the pending future
-                    async with self._pending_lock:
-                        future = self._pending_requests.pop(request_id, None)
-                    if future and not future.done():
-                        future.set_result(message)
-                    continue
+                frame = await websocket.recv()
 
-                # Check if this is a server-push message
-                if msg_type and msg_type.startswith("push_"):
-                    await self._handle_server_push(message)
+                message, body = decode_frame(frame)
+                if isinstance(message, list):
+                    for item in message:
+                        await self._dispatch(item)
                     continue
-
-                # For backward compatibility: treat as response to most recent request
-                # (This handles the current request-response pattern)
-                if self._pending_requests:
-                    async with self._pending_lock:
-                        if self._pending_requests:
-                            # Pop the oldest pending request
-                            oldest_id = min(self._pending_requests.keys())
-                            future = self._pending_requests.pop(oldest_id)
-                            if not future.done():
-                                future.set_result(message)
+                if body is not None:
+                    message["body"] = body
+                await self._dispatch(message)
 
             except websockets.ConnectionClosed:
                 self._connected = False
                 # Fail all pending requests so they don't wait for timeout
-                async with self._pending_lock:
-                    for request_id, future in list(self._pending_requests.items()):
-                        if not future.done():
-                            future.set_exception(
-                                ConnectionError("Connection closed by server")
-                            )
-                    self._pending_requests.clear()
+                for future in self._pending_requests.values():
+                    if not future.done():
+                        future.set_exception(
+                            ConnectionError("Connection closed by server")
+                        )
+                self._pending_requests.clear()
+                for stream in self._streams.values():
+                    stream.put_nowait(ConnectionError("Connection closed by server"))
                 break
             except asyncio.CancelledError:
                 break
@@ -672,6 +1473,38 @@ class PersistentRemoteConnection:
                 # Log error but continue
                 print(f"\033[2m(receive error: {e})\033[0m")
 
+    async def _dispatch(self, message: dict[str, Any]) -> None:
+        """Hand one received message to whatever is waiting for it."""
+        # Check if this is one of a streamed response's messages
+        rid = message.get("rid")
+        stream = self._streams.get(rid)
+        if stream is not None:
+            stream.put_nowait(message)
+            return
+
+        # Check if this is a response to a pending request
+        if rid is not None and rid in self._pending_requests:
+            # Complete the pending future
+            future = self._pending_requests.pop(rid)
+            if not future.done():
+                future.set_result(message)
+            return
+
+        # Check if this is a server-push message
+        msg_type = message.get("type")
+        if msg_type and msg_type.startswith("push_"):
+            await self._handle_server_push(message)
+            return
+
+        # For backward compatibility: servers that don't echo rid
+        # answer in order, so this is the response to the oldest request
+        if self._pending_requests:
+            # Dicts keep insertion order: the first key is the oldest
+            oldest_id = next(iter(self._pending_requests))
+            future = self._pending_requests.pop(oldest_id)
+            if not future.done():
+                future.set_result(message)
+
     async def _handle_server_push(self, message: dict):
         """Route a server-push message to the appropriate handler."""
         if self._message_router:
@@ -679,12 +1512,11 @@ class PersistentRemoteConnection:
 
     async def ensure_connected(self) -> RemoteClient:
         """Get client, reconnecting if needed."""
-        async with self._lock:
-            if self._client and self._connected and self._client._websocket:
-                # Trust the _connected flag - the receive loop will update it on errors
-                return self._client
+        if self._connected and self._client._websocket:
+            # Trust the _connected flag - the receive loop will update it on errors
+            return self._client
 
-            return await self._reconnect()
+        return await self._connect_once(self._reconnect)
 
     async def _reconnect(self) -> RemoteClient:
         """Attempt to reconnect with exponential backoff."""
@@ -693,21 +1525,12 @@ class PersistentRemoteConnection:
             try:
                 print(f"\033[2m(reconnecting to remote, attempt {attempt + 1}...)\033[0m")
 
-                if self._client:
-                    try:
-                        await self._client.disconnect()
-                    except Exception:
-                        pass
-
-                self._client = RemoteClient(
-                    host=self.host,
-                    port=self.port,
-                    private_key=self.private_key
-                )
-                await self._client.connect()
-                self._connected = True
-                self._start_ping_loop()
-                self._start_receive_loop()
+                try:
+                    await self._client.disconnect()
+                except Exception:
+                    pass
+
+                await self._establish()
                 print(f"\033[2m(reconnected)\033[0m")
                 return self._client
             except Exception as e:
@@ -721,6 +1544,14 @@ class PersistentRemoteConnection:
         """Clean shutdown."""
         self._connected = False
 
+        # Abandon any connection attempt in progress
+        if self._connect_task and not self._connect_task.done():
+            self._connect_task.cancel()
+            try:
+                await self._connect_task
+            except (asyncio.CancelledError, Exception):
+                pass
+
         # Cancel receive loop
         if self._receive_task:
             self._receive_task.cancel()
@@ -737,16 +1568,29 @@ class PersistentRemoteConnection:
             except asyncio.CancelledError:
                 pass
 
+        if self._batcher:
+            self._batcher.cancel()
+            self._batcher = None
+
         # Cancel any pending requests
-        async with self._pending_lock:
-            for future in self._pending_requests.values():
-                if not future.done():
-                    future.cancel()
-            self._pending_requests.clear()
+        for future in self._pending_requests.values():
+            if not future.done():
+                future.cancel()
+        self._pending_requests.clear()
+        for stream in self._streams.values():
+            stream.put_nowait(ConnectionError("Disconnected from remote server"))
+
+        await self._client.disconnect()
+
+    def _next_rid(self) -> int:
+        """Allocate a unique integer request id.
 
-        if self._client:
-            await self._client.disconnect()
-            self._client = None
+        The pending-request table and the counter are only touched from the
+        event loop, between awaits, so they need no lock.
+        """
+        rid = self._rid_counter
+        self._rid_counter += 1
+        return rid
 
     async def _send_and_wait(
         self,
@@ -755,42 +1599,41 @@ class PersistentRemoteConnection:
     ) -> dict[str, Any]:
         """Send a message and wait for its correlated response.
 
-        Uses request_id for correlation with the central receive loop.
+        Uses rid for correlation with the central receive loop.
         """
-        if not self._client or not self._client._websocket:
-            raise ConnectionError("Not connected to remote server")
+        rid = self._next_rid()
+        message["rid"] = rid
+        return await self._send_frame_and_wait(rid, message, timeout)
 
-        # Generate unique request ID
-        async with self._pending_lock:
-            self._request_id_counter += 1
-            request_id = f"req_{self._request_id_counter}"
+    async def _send_frame_and_wait(
+        self,
+        rid: int,
+        frame: dict[str, Any] | bytes | str,
+        timeout: float
+    ) -> dict[str, Any]:
+        """Send a request tagged with rid and wait for its response.
 
-        # Add request_id to message for correlation
-        message["request_id"] = request_id
+        Args:
+            rid: The request's rid (already set in frame)
+            frame: Message dict, or the message already encoded
+            timeout: Seconds to wait for the response
+        """
+        if not self._client._websocket or not self._batcher:
+            raise ConnectionError("Not connected to remote server")
 
         # Create future for response
-        loop = asyncio.get_event_loop()
-        future: asyncio.Future = loop.create_future()
-
-        async with self._pending_lock:
-            self._pending_requests[request_id] = future
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending_requests[rid] = future
 
         try:
-            # Send the request
-            await self._client._websocket.send(json.dumps(message))
+            # Queue the request; the batcher sends it with any others
+            # queued alongside it
+            self._batcher.send(frame, future)
 
             # Wait for correlated response from receive loop
-            response = await asyncio.wait_for(future, timeout=timeout)
-            return response
-
-        except asyncio.TimeoutError:
-            async with self._pending_lock:
-                self._pending_requests.pop(request_id, None)
-            raise
-        except Exception:
-            async with self._pending_lock:
-                self._pending_requests.pop(request_id, None)
-            raise
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending_requests.pop(rid, None)
 
     async def execute_command(
         self,
@@ -801,20 +1644,13 @@ class PersistentRemoteConnection:
         """Execute command using persistent connection with full duplex support."""
         await self.ensure_connected()
 
-        request = CommandRequest(command=command, cwd=cwd, timeout=timeout)
-        message = sign_message(
-            self.private_key,
-            MessageType.COMMAND,
-            request.to_payload()
-        )
+        # Same dict as CommandRequest.to_payload(), built directly on this hot path
+        payload = {"command": command, "cwd": cwd, "timeout": timeout}
+        rid = self._next_rid()
+        frame = sign_message_frame(self.private_key, MessageType.COMMAND, payload, rid)
 
-        response = await self._send_and_wait(message, timeout=timeout + 10)
-
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Remote error: {error.error} ({error.code})")
-
-        return CommandResponse.from_payload(response["payload"])
+        response = await self._send_frame_and_wait(rid, frame, timeout=timeout + 10)
+        return _parse_response(MessageType.COMMAND, response)
 
     async def upload_file(
         self,
@@ -825,57 +1661,133 @@ class PersistentRemoteConnection:
         """Upload file using persistent connection with full duplex support."""
         await self.ensure_connected()
 
-        local_path = Path(local_path).expanduser().resolve()
+        local_path = _resolve_local_path(local_path)
         if not local_path.exists():
             raise FileNotFoundError(f"Local file not found: {local_path}")
         if not local_path.is_file():
             raise ValueError(f"Not a file: {local_path}")
 
-        data = local_path.read_bytes()
+        size = (await asyncio.to_thread(local_path.stat)).st_size
+        if size >= CHUNKED_UPLOAD_THRESHOLD:
+            return await self._upload_chunked(local_path, remote_path, mode, size)
+
+        # Disk I/O runs in a worker thread so other requests keep flowing
+        data = await asyncio.to_thread(local_path.read_bytes)
         request = UploadRequest(remote_path=remote_path, data=data, mode=mode)
-        message = sign_message(
-            self.private_key,
-            MessageType.UPLOAD,
-            request.to_payload()
-        )
+        message = await _sign_request(self.private_key, MessageType.UPLOAD, request, len(data))
 
         response = await self._send_and_wait(message, timeout=300.0)
+        return _parse_response(MessageType.UPLOAD, response)
 
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Upload failed: {error.error} ({error.code})")
+    async def _upload_chunked(
+        self,
+        local_path: Path,
+        remote_path: str,
+        mode: str,
+        size: int
+    ) -> UploadResponse:
+        """Upload a large file as UPLOAD_BEGIN followed by UPLOAD_CHUNK messages.
+
+        Chunks are written to the socket directly rather than through the
+        batcher: each one fills a frame on its own, and awaiting send()
+        applies the connection's flow control so the file is never queued
+        in memory. Sending stops early if the server reports an error.
+        """
+        websocket = self._client._websocket
+        if not websocket:
+            raise ConnectionError("Not connected to remote server")
 
-        return UploadResponse.from_payload(response["payload"])
+        rid = self._next_rid()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending_requests[rid] = future
+
+        try:
+            begin = UploadBeginRequest(remote_path=remote_path, size=size, mode=mode)
+            message = sign_message(self.private_key, MessageType.UPLOAD_BEGIN, begin.to_payload())
+            message["rid"] = rid
+            await websocket.send(encode_frame(message))
+            await _send_upload_chunks(
+                self.private_key, local_path, size, rid, websocket.send, future
+            )
+
+            response = await asyncio.wait_for(future, timeout=300.0)
+        finally:
+            self._pending_requests.pop(rid, None)
+
+        return _parse_response(MessageType.UPLOAD, response)
 
     async def download_file(
         self,
         remote_path: str,
         local_path: str | Path | None = None
     ) -> tuple[bytes, DownloadResponse]:
-        """Download file using persistent connection with full duplex support."""
+        """Download file using persistent connection with full duplex support.
+
+        With a local_path the file is streamed to disk chunk by chunk and
+        the returned data is empty; without one it is returned in memory.
+        """
         await self.ensure_connected()
 
-        request = DownloadRequest(remote_path=remote_path)
-        message = sign_message(
-            self.private_key,
-            MessageType.DOWNLOAD,
-            request.to_payload()
+        if local_path:
+            local_path = _resolve_local_path(local_path)
+            return b"", await _download_into_file(
+                partial(self._download_chunks, remote_path), local_path
+            )
+
+        buffer = bytearray()
+
+        async def append(data):
+            buffer.extend(data)
+
+        size = await self._download_chunks(remote_path, append)
+        data = bytes(buffer)
+        return data, DownloadResponse(
+            success=True,
+            data=data,
+            size=size,
+            message=f"Downloaded {size} bytes"
         )
 
-        response = await self._send_and_wait(message, timeout=300.0)
+    async def _download_chunks(
+        self,
+        remote_path: str,
+        write: Callable[[bytes], Awaitable[None]]
+    ) -> int:
+        """Stream a remote file as binary DOWNLOAD_CHUNK frames.
 
-        if response["type"] == MessageType.ERROR:
-            error = ErrorResponse.from_payload(response["payload"])
-            raise RuntimeError(f"Download failed: {error.error} ({error.code})")
+        The receive loop hands each chunk to this request's stream queue,
+        so other requests keep flowing while the file arrives.
 
-        download_response = DownloadResponse.from_payload(response["payload"])
+        Args:
+            remote_path: File to download
+            write: Coroutine function called with each chunk's data
 
-        if local_path and download_response.data:
-            local_path = Path(local_path).expanduser().resolve()
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            local_path.write_bytes(download_response.data)
+        Returns:
+            Total number of bytes received
+        """
+        if not self._client._websocket or not self._batcher:
+            raise ConnectionError("Not connected to remote server")
 
-        return download_response.data or b"", download_response
+        request = DownloadRequest(
+            remote_path=remote_path,
+            chunk_size=DOWNLOAD_CHUNK_SIZE,
+            binary=True,
+            compress=COMPRESS_TRANSFERS
+        )
+        message = sign_message(
+            self.private_key,
+            MessageType.DOWNLOAD,
+            request.to_payload()
+        )
+        rid = self._next_rid()
+        message["rid"] = rid
+        stream: asyncio.Queue = asyncio.Queue()
+        self._streams[rid] = stream
+        try:
+            self._batcher.send(message, stream)
+            return await _read_download_stream(stream, write, timeout=300.0)
+        finally:
+            self._streams.pop(rid, None)
 
     async def execute_script(
         self,
@@ -889,67 +1801,68 @@ class PersistentRemoteConnection:
     ) -> ScriptCompleteResponse:
         """Execute script with streaming output using persistent connection.
 
-        Note: Script execution temporarily pauses the receive loop to handle
-        streaming output directly, then resumes it after completion.
+        The receive loop keeps running: it hands this script's frames to a
+        stream queue for this request, so other requests and server-push
+        messages are still served while the script runs.
         """
         await self.ensure_connected()
 
-        if not self._client or not self._client._websocket:
+        if not self._client._websocket or not self._batcher:
             raise ConnectionError("Not connected to remote server")
 
-        # Pause receive loop during script execution to handle streaming directly
-        if self._receive_task and not self._receive_task.done():
-            self._receive_task.cancel()
-            try:
-                await self._receive_task
-            except asyncio.CancelledError:
-                pass
-
-        try:
-            request = ScriptRequest(
-                script_id=script_id,
-                script=script,
-                interpreter=interpreter,
-                cwd=cwd,
-                timeout=timeout,
-                env=env,
-            )
+        request = ScriptRequest(
+            script_id=script_id,
+            script=script,
+            interpreter=interpreter,
+            cwd=cwd,
+            timeout=timeout,
+            env=env,
+        )
 
-            message = sign_message(
-                self.private_key,
-                MessageType.SCRIPT,
-                request.to_payload()
-            )
+        message = sign_message(
+            self.private_key,
+            MessageType.SCRIPT,
+            request.to_payload()
+        )
+        rid = self._next_rid()
+        message["rid"] = rid
+        stream: asyncio.Queue = asyncio.Queue()
+        self._streams[rid] = stream
+        writer = _CoalescingWriter(on_output) if on_output else None
+        # Plain-str locals for the per-frame type comparisons below
+        script_output = MessageType.SCRIPT_OUTPUT.value
+        script_complete = MessageType.SCRIPT_COMPLETE.value
+        error_type = MessageType.ERROR.value
 
-            # Send request
-            await self._client._websocket.send(json.dumps(message))
+        try:
+            self._batcher.send(message, stream)
 
             # Receive streaming output until completion
-            while True:
-                response_text = await asyncio.wait_for(
-                    self._client._websocket.recv(),
-                    timeout=timeout + 60  # Extra time for completion message
-                )
-                response = json.loads(response_text)
+            async with asyncio.timeout(timeout + 60):  # Extra time for completion message
+                while True:
+                    response = await stream.get()
+                    if isinstance(response, Exception):
+                        raise response
 
-                msg_type = response["type"]
-                payload = response["payload"]
+                    msg_type = response["type"]
+                    payload = response["payload"]
 
-                if msg_type == MessageType.SCRIPT_OUTPUT:
-                    chunk = ScriptOutputChunk.from_payload(payload)
-                    if on_output:
-                        on_output(chunk.stream, chunk.data)
+                    if msg_type == script_output:
+                        # Hot path: pass the fields straight from the payload
+                        # instead of building a ScriptOutputChunk
+                        if writer:
+                            writer.feed(payload["stream"], payload["data"])
 
-                elif msg_type == MessageType.SCRIPT_COMPLETE:
-                    return ScriptCompleteResponse.from_payload(payload)
+                    elif msg_type == script_complete:
+                        return ScriptCompleteResponse.from_payload(payload)
 
-                elif msg_type == MessageType.ERROR:
-                    error = ErrorResponse.from_payload(payload)
-                    raise RuntimeError(f"Script execution failed: {error.error} ({error.code})")
+                    elif msg_type == error_type:
+                        _raise_if_error(MessageType.SCRIPT, response)
 
         finally:
-            # Resume receive loop
-            self._start_receive_loop()
+            if writer:
+                writer.flush()
+            self._streams.pop(rid, None)
 
 
 class RemoteSession:
@@ -967,8 +1880,10 @@ class RemoteSession:
         self._loop_thread: threading.Thread | None = None
         self._started = False
 
-        # Thread-safe notification queue for server-push messages
-        self._notification_queue: queue.Queue = queue.Queue()
+        # Thread-safe notification queue for server-push messages. SimpleQueue
+        # is unbounded and C-implemented: put() from the event loop thread
+        # never waits on the main thread's consumer.
+        self._notification_queue: queue.SimpleQueue = queue.SimpleQueue()
         self._message_router: MessageRouter | None = None
 
     def start(self, timeout: float = 30.0):
@@ -979,7 +1894,7 @@ class RemoteSession:
         # Create message router with notification queue
         self._message_router = MessageRouter(self._notification_queue)
 
-        self._loop = asyncio.new_event_loop()
+        self._loop = new_event_loop()
         self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
         self._loop_thread.start()
 
@@ -1134,24 +2049,30 @@ class RemoteSession:
         This should be called periodically from the main shell loop,
         typically during idle time or after each user interaction.
 
+        Up to max_count notifications are taken off the queue in one go,
+        then each is passed to all of its handlers.
+
         Args:
             max_count: Maximum notifications to process per call
 
         Returns:
             Number of notifications processed
         """
-        processed = 0
-        while processed < max_count:
-            try:
-                msg, handler = self._notification_queue.get_nowait()
+        get = self._notification_queue.get_nowait
+        batch = []
+        try:
+            while len(batch) < max_count:
+                batch.append(get())
+        except queue.Empty:
+            pass
+
+        for msg, handlers in batch:
+            for handler in handlers:
                 try:
                     handler(msg)
                 except Exception as e:
                     print(f"\033[2m(notification handler error: {e})\033[0m")
-                processed += 1
-            except queue.Empty:
-                break
-        return processed
+        return len(batch)
 
     def has_pending_notifications(self) -> bool:
         """Check if there are pending notifications."""
@@ -1,31 +1,273 @@
 """Shell script execution tool for nlsh."""
 
 import asyncio
-from typing import Annotated
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Annotated, Any, Coroutine
 
 from script_types import GeneratedScript, ScriptReview, RiskLevel
-from subagents import ScriptExecutor, ScriptReviewer
+
+# Add shared package to path (once; skipped when already importable from there)
+_PACKAGES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PACKAGES_DIR not in sys.path:
+    sys.path.insert(0, _PACKAGES_DIR)
+from shared.event_loop import new_event_loop
+
+# The subagents package is imported on first use, not when nlshell loads
+# this tool module
+if TYPE_CHECKING:
+    from subagents import ScriptExecutor, ScriptReviewer
 
 
 # Global executor instance (initialized on first use)
-_executor: ScriptExecutor | None = None
-_reviewer: ScriptReviewer | None = None
+_executor: "ScriptExecutor | None" = None
+_reviewer: "ScriptReviewer | None" = None
+
+# Event loop shared by every script review/execution, run forever in a
+# daemon thread (started on first use)
+_loop: asyncio.AbstractEventLoop | None = None
+
+# Guards first-use creation of the globals above. Getters check without
+# the lock first, so it is only taken until each one exists.
+_init_lock = threading.Lock()
+
+# Reviews of recently seen scripts, least recently used first. A review
+# depends only on the script text, so it is keyed by a digest of that.
+REVIEW_CACHE_SIZE = 256
+_review_cache: OrderedDict[bytes, ScriptReview] = OrderedDict()
+
+# Script preview rule
+_HR = "─" * 60
+
+# Formatted step lists of recent previews; regenerated scripts often
+# repeat the same steps. Oldest entries are dropped first.
+STEPS_CACHE_SIZE = 128
+_steps_cache: dict[tuple[str, ...], str] = {}
+
+# Local script output is written at most this often (seconds), or as soon
+# as this many characters are waiting
+OUTPUT_FLUSH_INTERVAL = 0.02
+OUTPUT_FLUSH_SIZE = 4096
+
+# Script stderr is shown in red
+_STDERR_COLOR = "\033[1;31m"
+_COLOR_RESET = "\033[0m"
+
+# Confirmation prompts and accepted answers
+_PROMPT_DANGEROUS = "Execute? Type 'EXECUTE' to confirm: "
+_PROMPT_NORMAL = "Execute? [y/n/e(dit)/f(eedback)]: "
+_YES = frozenset({"y", "yes"})
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop for script coroutines."""
+    global _loop
+    loop = _loop
+    if loop is None:
+        with _init_lock:
+            if _loop is None:
+                new_loop = new_event_loop()
+                threading.Thread(
+                    target=new_loop.run_forever, name="nlsh-script-loop", daemon=True
+                ).start()
+                _loop = new_loop
+            loop = _loop
+    return loop
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine on the background loop and wait for its result.
+
+    Unlike asyncio.run(), no event loop is created and torn down per call.
+    If the wait is interrupted (Ctrl+C), the coroutine is cancelled.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def _emit(text: str) -> None:
+    """Write pre-built terminal output straight to stdout's binary buffer.
+
+    The text is encoded once and written in a single call, bypassing
+    print() and the text layer. Anything already buffered in sys.stdout
+    is flushed first so output stays in order. Falls back to
+    sys.stdout.write() when stdout has no binary buffer (e.g. a StringIO).
+    """
+    out = sys.stdout
+    buffer = getattr(out, "buffer", None)
+    if buffer is None:
+        out.write(text)
+        out.flush()
+        return
+    out.flush()
+    buffer.write(text.encode(out.encoding or "utf-8", errors="replace"))
+    buffer.flush()
+
+
+class _OutputPrinter:
+    """Print streamed script output, coalescing chunks into fewer writes.
+
+    With a loop, it is called from that loop's thread: chunks are
+    buffered in arrival order and written together once OUTPUT_FLUSH_SIZE
+    characters are waiting or OUTPUT_FLUSH_INTERVAL has passed since the
+    first of them. Without one, each chunk is written as it arrives (for
+    sources that already batch their output).
+
+    stderr is shown in red. The color is switched on when output moves
+    from stdout to stderr and off when it moves back, rather than around
+    every chunk; close() makes sure it ends up off.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None):
+        self._loop = loop
+        self._pending: list[tuple[str, str]] = []
+        self._size = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._in_stderr = False
+
+    def __call__(self, stream: str, data: str) -> None:
+        self._pending.append((stream, data))
+        self._size += len(data)
+        if self._loop is None or self._size >= OUTPUT_FLUSH_SIZE:
+            self.flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(OUTPUT_FLUSH_INTERVAL, self.flush)
+
+    def flush(self) -> None:
+        """Write everything buffered so far."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        parts = []
+        in_stderr = self._in_stderr
+        for stream, data in self._pending:
+            if (stream != "stdout") != in_stderr:
+                in_stderr = not in_stderr
+                parts.append(_STDERR_COLOR if in_stderr else _COLOR_RESET)
+            parts.append(data)
+        self._in_stderr = in_stderr
+        self._pending.clear()
+        self._size = 0
+        _emit("".join(parts))
+
+    def close(self) -> None:
+        """Write anything still buffered and leave the color reset."""
+        if self._in_stderr:
+            # Switches back to stdout, emitting the reset in the same write
+            self._pending.append(("stdout", ""))
+        self.flush()
+
+
+async def _execute_local(script: str, cwd: str, total_steps: int):
+    """Run a script with the local executor, printing its output as it streams."""
+    printer = _OutputPrinter(asyncio.get_running_loop())
+    try:
+        return await get_executor().execute_script(
+            script_id="local",
+            script_content=script,
+            cwd=cwd,
+            timeout=3600,
+            on_output=printer,
+            total_steps=total_steps,
+        )
+    finally:
+        printer.close()
 
 
-def get_executor() -> ScriptExecutor:
+def get_executor() -> "ScriptExecutor":
     """Get or create the global script executor."""
     global _executor
-    if _executor is None:
-        _executor = ScriptExecutor()
-    return _executor
+    executor = _executor
+    if executor is None:
+        with _init_lock:
+            if _executor is None:
+                from subagents import ScriptExecutor
+                _executor = ScriptExecutor()
+            executor = _executor
+    return executor
 
 
-def get_reviewer() -> ScriptReviewer:
+def get_reviewer() -> "ScriptReviewer":
     """Get or create the global script reviewer."""
     global _reviewer
-    if _reviewer is None:
-        _reviewer = ScriptReviewer()
-    return _reviewer
+    reviewer = _reviewer
+    if reviewer is None:
+        with _init_lock:
+            if _reviewer is None:
+                from subagents import ScriptReviewer
+                _reviewer = ScriptReviewer()
+            reviewer = _reviewer
+    return reviewer
+
+
+async def _review_and_format(generated: GeneratedScript) -> tuple[ScriptReview, str]:
+    """Review a script while its code listing is formatted in a worker thread."""
+    review, code = await asyncio.gather(
+        get_reviewer().process(generated),
+        asyncio.to_thread(_format_code, generated.script),
+    )
+    return review, code
+
+
+def review_script(
+    generated: GeneratedScript,
+    inline: bool = False,
+) -> tuple[ScriptReview, str]:
+    """Review a script and format its code listing for display.
+
+    Trivially safe scripts are approved on the spot, and the review of
+    an identical earlier script is reused; otherwise the review and the
+    formatting run concurrently on the background loop.
+
+    Args:
+        generated: The script to review
+        inline: Run a full review directly in this thread instead of
+            submitting it to the background loop
+
+    Returns:
+        Tuple of (ScriptReview, formatted code listing). The review is
+        shared with the cache; don't modify it.
+    """
+    review = get_reviewer().quick_review(generated)
+    if review is not None:
+        return review, _format_code(generated.script)
+
+    key = hashlib.blake2b(generated.script.encode('utf-8'), digest_size=16).digest()
+    review = _review_cache.get(key)
+    if review is not None:
+        _review_cache.move_to_end(key)
+        return review, _format_code(generated.script)
+
+    if inline:
+        review, code = get_reviewer().review(generated), _format_code(generated.script)
+    else:
+        review, code = run_sync(_review_and_format(generated))
+    _review_cache[key] = review
+    if len(_review_cache) > REVIEW_CACHE_SIZE:
+        _review_cache.popitem(last=False)
+    return review, code
+
+
+def _format_steps(steps: list[str]) -> str:
+    """Format the numbered step lines of a script preview, with caching."""
+    key = tuple(steps)
+    block = _steps_cache.get(key)
+    if block is None:
+        block = "\n".join([f"│   {i}. {step}" for i, step in enumerate(steps, 1)])
+        _steps_cache[key] = block
+        if len(_steps_cache) > STEPS_CACHE_SIZE:
+            del _steps_cache[next(iter(_steps_cache))]
+    return block
 
 
 def display_script_preview(
@@ -33,7 +275,7 @@ def display_script_preview(
     name: str,
     explanation: str,
     steps: list[str],
-    risk_level: str,
+    risk_level: RiskLevel,
 ) -> None:
     """Display a script preview to the user.
 
@@ -42,27 +284,26 @@ def display_script_preview(
         name: Script name
         explanation: What the script does
         steps: List of step descriptions
-        risk_level: Risk level string
+        risk_level: Risk level
     """
-    # Risk emoji
-    risk_emojis = {
-        "safe": "✅",
-        "moderate": "⚠️",
-        "dangerous": "🔶",
-        "critical": "🚫",
-    }
-    emoji = risk_emojis.get(risk_level.lower(), "❓")
-
-    print(f"\n{'─' * 60}")
-    print(f"│ Script: {name}")
-    print(f"{'─' * 60}")
-    print("│ Steps:")
-    for i, step in enumerate(steps, 1):
-        print(f"│   {i}. {step}")
-    print(f"{'─' * 60}")
-    print(f"│ Risk: {emoji} {risk_level.upper()}")
-    print(f"│ {explanation}")
-    print(f"{'─' * 60}")
+
+    # Build the whole box and write it at once
+    parts = ["", _HR, f"│ Script: {name}", _HR, "│ Steps:"]
+    if steps:
+        parts.append(_format_steps(steps))
+    parts += [_HR, f"│ Risk: {risk_level.emoji} {risk_level.value.upper()}", f"│ {explanation}", _HR]
+    _emit("\n".join(parts) + "\n")
+
+
+def _format_code(script: str) -> str:
+    """Format script code with line numbers, as display_script_code() prints it."""
+    lines = script.split('\n')
+    width = len(str(len(lines)))
+    # rjust is cheaper per line than a nested {i:>{width}} format spec
+    numbered = "\n".join([
+        f"\033[2m{str(i).rjust(width)}│\033[0m {line}" for i, line in enumerate(lines, 1)
+    ])
+    return f"\n{numbered}\n\n"
 
 
 def display_script_code(script: str) -> None:
@@ -71,12 +312,7 @@ def display_script_code(script: str) -> None:
     Args:
         script: The script content
     """
-    lines = script.split('\n')
-    width = len(str(len(lines)))
-    print()
-    for i, line in enumerate(lines, 1):
-        print(f"\033[2m{i:>{width}}│\033[0m {line}")
-    print()
+    _emit(_format_code(script))
 
 
 def run_shell_script(
@@ -113,8 +349,6 @@ def run_shell_script(
     from nlshell import (
         is_remote_mode,
         get_remote_cwd,
-        get_remote_port,
-        get_remote_private_key,
         get_shell_state,
         get_skip_permissions,
         input_no_history,
@@ -122,7 +356,7 @@ def run_shell_script(
     )
 
     # Create a GeneratedScript object for review
-    generated = GeneratedScript(
+    generated = GeneratedScript.acquire(
         script=script,
         name=name,
         explanation=explanation,
@@ -130,13 +364,16 @@ def run_shell_script(
         risk_level=RiskLevel.MODERATE if warning else RiskLevel.SAFE,
     )
 
-    # Review the script for safety
-    reviewer = get_reviewer()
-
-    async def do_review():
-        return await reviewer.process(generated)
-
-    review = asyncio.run(do_review())
+    # Review the script for safety. When it will be auto-executed with no
+    # explicit warning, nobody is waiting on a prompt, so skip the loop
+    # round trip and review in this thread; CRITICAL scripts are still
+    # rejected below.
+    try:
+        review, code_listing = review_script(
+            generated, inline=get_skip_permissions() and not warning
+        )
+    finally:
+        generated.release()
 
     # Display preview
     display_script_preview(
@@ -144,7 +381,7 @@ def run_shell_script(
         name=name,
         explanation=explanation,
         steps=steps,
-        risk_level=review.risk_level.value,
+        risk_level=review.risk_level,
     )
 
     # Show warnings from review
@@ -163,7 +400,7 @@ def run_shell_script(
         return "Script rejected: Contains critical safety issues that cannot be executed."
 
     # Always show the script content
-    display_script_code(script)
+    _emit(code_listing)
 
     # Handle auto-execution mode
     if get_skip_permissions():
@@ -171,15 +408,13 @@ def run_shell_script(
     else:
         # Confirmation prompt
         if review.risk_level == RiskLevel.DANGEROUS:
-            prompt = "Execute? Type 'EXECUTE' to confirm: "
-            response = input_no_history(prompt).strip()
+            response = input_no_history(_PROMPT_DANGEROUS).strip()
             if response != "EXECUTE":
                 raise CommandCancelled()
         elif review.risk_level == RiskLevel.CRITICAL:
             raise CommandCancelled()
         else:
-            prompt = "Execute? [y/n/e(dit)/f(eedback)]: "
-            response = input_no_history(prompt).lower().strip()
+            response = input_no_history(_PROMPT_NORMAL).strip().lower()
 
             if response == "f":
                 feedback = input_no_history("Feedback for LLM: ")
@@ -187,7 +422,7 @@ def run_shell_script(
             elif response == "e":
                 print("Script editing not yet implemented. Please provide feedback instead.")
                 raise CommandCancelled()
-            elif response not in ("y", "yes"):
+            elif response not in _YES:
                 raise CommandCancelled()
 
     # Get working directory - use getter function for runtime value
@@ -198,26 +433,21 @@ def run_shell_script(
         cwd = str(get_shell_state().cwd)
         print(f"\033[2mExecuting script locally...\033[0m\n")
 
-    # Output callback for streaming
-    def on_output(stream: str, data: str):
-        if stream == "stdout":
-            print(data, end="")
-        else:
-            print(f"\033[1;31m{data}\033[0m", end="")
-
     if is_remote_mode():
-        # Execute on remote server using persistent session
+        # Execute on remote server using persistent session (which already
+        # coalesces output before calling on_output)
         from nlshell import get_remote_session
 
         session = get_remote_session()
         if session is None:
             return "Error: Remote session not available"
 
+        printer = _OutputPrinter()
         try:
             response = session.execute_script(
                 script_id="remote-script",
                 script=script,
-                on_output=on_output,
+                on_output=printer,
                 cwd=cwd,
                 timeout=3600,
             )
@@ -235,21 +465,11 @@ def run_shell_script(
             error_message = str(e)
             stdout = ""
             stderr = str(e)
+        finally:
+            printer.close()
     else:
         # Execute locally
-        executor = get_executor()
-
-        async def do_execute():
-            return await executor.execute_script(
-                script_id="local",
-                script_content=script,
-                cwd=cwd,
-                timeout=3600,
-                on_output=on_output,
-                total_steps=len(steps),
-            )
-
-        result = asyncio.run(do_execute())
+        result = run_sync(_execute_local(script, cwd, len(steps)))
         success = result.success
         returncode = result.returncode
         duration = result.duration_seconds
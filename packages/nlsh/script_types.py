@@ -1,16 +1,48 @@
 """Type definitions for shell script generation and execution."""
 
+import json
+import os
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _dumps(data: dict[str, Any]) -> bytes:
+    """Encode a to_dict() result as compact UTF-8 JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes | str) -> dict[str, Any]:
+    """Decode JSON produced by _dumps()."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class RiskLevel(str, Enum):
-    """Risk level for script operations."""
-    SAFE = "safe"
-    MODERATE = "moderate"
-    DANGEROUS = "dangerous"
-    CRITICAL = "critical"
+    """Risk level for script operations.
+
+    Each member also carries the emoji shown next to it, as .emoji.
+    """
+    SAFE = "safe", "✅"
+    MODERATE = "moderate", "⚠️"
+    DANGEROUS = "dangerous", "🔶"
+    CRITICAL = "critical", "🚫"
+
+    def __new__(cls, value: str, emoji: str):
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.emoji = emoji
+        return member
 
 
 class ExecutionStatus(str, Enum):
@@ -29,7 +61,7 @@ class EstimatedDuration(str, Enum):
     LONG = "long"        # > 2 minutes
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedScript:
     """Output from ScriptGenerator subagent."""
     script: str                           # Complete bash script
@@ -40,6 +72,51 @@ class GeneratedScript:
     risk_level: RiskLevel = RiskLevel.SAFE
     estimated_duration: EstimatedDuration = EstimatedDuration.QUICK
 
+    @classmethod
+    def acquire(
+        cls,
+        script: str,
+        name: str,
+        explanation: str,
+        steps: list[str],
+        risk_level: RiskLevel = RiskLevel.SAFE,
+    ) -> "GeneratedScript":
+        """Get a GeneratedScript, reusing a released one when pooling is on.
+
+        Pooling is enabled with NLSH_POOL_SCRIPTS=1 and only pays off in
+        very hot loops; otherwise this simply constructs a new instance.
+        """
+        if not _script_pool:
+            return cls(
+                script=script,
+                name=name,
+                explanation=explanation,
+                steps=steps,
+                risk_level=risk_level,
+            )
+        generated = _script_pool.pop()
+        generated.script = script
+        generated.name = name
+        generated.explanation = explanation
+        generated.steps = steps
+        generated.risk_level = risk_level
+        return generated
+
+    def release(self) -> None:
+        """Return an acquire()d instance to the pool; don't use it afterwards.
+
+        Does nothing unless pooling is on. The script and explanation
+        text are dropped, and the variables dict is cleared for reuse.
+        The steps list belongs to the caller and is left untouched.
+        """
+        if not SCRIPT_POOL_ENABLED:
+            return
+        self.script = ""
+        self.explanation = ""
+        self.variables.clear()
+        self.estimated_duration = EstimatedDuration.QUICK
+        _script_pool.append(self)
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
@@ -52,6 +129,15 @@ class GeneratedScript:
             "estimated_duration": self.estimated_duration.value,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes (orjson when available)."""
+        return _dumps(self.to_dict())
+
+    @classmethod
+    def from_json_bytes(cls, data: bytes | str) -> "GeneratedScript":
+        """Create from JSON bytes produced by to_json_bytes()."""
+        return cls.from_dict(_loads(data))
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "GeneratedScript":
         """Create from dictionary."""
@@ -66,7 +152,12 @@ class GeneratedScript:
         )
 
 
-@dataclass
+# Free list for GeneratedScript.acquire()/release(), opt-in via env var
+SCRIPT_POOL_ENABLED = os.getenv("NLSH_POOL_SCRIPTS", "0") == "1"
+_script_pool: deque[GeneratedScript] = deque(maxlen=64)
+
+
+@dataclass(slots=True, frozen=True)
 class ScriptReview:
     """Output from ScriptReviewer subagent."""
     approved: bool
@@ -85,6 +176,15 @@ class ScriptReview:
             "suggestions": self.suggestions,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes (orjson when available)."""
+        return _dumps(self.to_dict())
+
+    @classmethod
+    def from_json_bytes(cls, data: bytes | str) -> "ScriptReview":
+        """Create from JSON bytes produced by to_json_bytes()."""
+        return cls.from_dict(_loads(data))
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ScriptReview":
         """Create from dictionary."""
@@ -97,7 +197,7 @@ class ScriptReview:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecutionResult:
     """Output from ScriptExecutor subagent."""
     script_id: str
@@ -124,6 +224,15 @@ class ExecutionResult:
             "error_message": self.error_message,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes (orjson when available)."""
+        return _dumps(self.to_dict())
+
+    @classmethod
+    def from_json_bytes(cls, data: bytes | str) -> "ExecutionResult":
+        """Create from JSON bytes produced by to_json_bytes()."""
+        return cls.from_dict(_loads(data))
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ExecutionResult":
         """Create from dictionary."""
@@ -140,7 +249,7 @@ class ExecutionResult:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptWorkflowState:
     """Shared state between subagents during script workflow."""
     # Request context
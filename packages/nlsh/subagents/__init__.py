@@ -1,15 +1,18 @@
 """Subagents for shell script generation and execution."""
 
-# Ensure parent directory is in path for absolute imports
+# Ensure parent directory is in path for the submodules' absolute imports
+# (script_types); added once, so re-imports don't grow sys.path
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_NLSH_DIR = str(Path(__file__).parent.parent)
+if _NLSH_DIR not in sys.path:
+    sys.path.insert(0, _NLSH_DIR)
 
-from subagents.base import BaseSubagent
-from subagents.generator import ScriptGenerator
-from subagents.reviewer import ScriptReviewer
-from subagents.executor import ScriptExecutor
-from subagents.orchestrator import ScriptOrchestrator
+from .base import BaseSubagent
+from .generator import ScriptGenerator
+from .reviewer import ScriptReviewer
+from .executor import ScriptExecutor
+from .orchestrator import ScriptOrchestrator
 
 __all__ = [
     "BaseSubagent",
@@ -1,12 +1,11 @@
 """Base class for script subagents."""
 
-from abc import ABC, abstractmethod
 from typing import Any, TypeVar, Generic
 
 T = TypeVar("T")
 
 
-class BaseSubagent(ABC, Generic[T]):
+class BaseSubagent(Generic[T]):
     """Base class for all script-related subagents.
 
     Subagents are specialized components that handle specific aspects of
@@ -14,6 +13,9 @@ class BaseSubagent(ABC, Generic[T]):
     - ScriptGenerator: Converts natural language to shell scripts
     - ScriptReviewer: Analyzes scripts for safety and correctness
     - ScriptExecutor: Executes scripts with streaming output
+
+    Subclasses must override process(). This is a plain class rather than
+    an ABC, so creating subagents skips the ABCMeta abstract-method checks.
     """
 
     def __init__(self, name: str):
@@ -24,7 +26,6 @@ class BaseSubagent(ABC, Generic[T]):
         """
         self.name = name
 
-    @abstractmethod
     async def process(self, **kwargs: Any) -> T:
         """Process input and return output.
 
@@ -33,7 +34,7 @@ class BaseSubagent(ABC, Generic[T]):
         Returns:
             The processed output of type T
         """
-        pass
+        raise NotImplementedError(f"{self.__class__.__name__} must implement process()")
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} name={self.name!r}>"
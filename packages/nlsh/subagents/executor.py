@@ -7,6 +7,7 @@ import signal
 import tempfile
 import time
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable
@@ -24,11 +25,11 @@ class RunningScript:
     """Tracks a running script's state."""
     script_id: str
     process: asyncio.subprocess.Process
-    temp_file: Path
+    temp_file: str
     start_time: float
     status: ExecutionStatus = ExecutionStatus.RUNNING
-    stdout_buffer: list[str] = field(default_factory=list)
-    stderr_buffer: list[str] = field(default_factory=list)
+    stdout_buf: bytearray = field(default_factory=bytearray)
+    stderr_buf: bytearray = field(default_factory=bytearray)
     stdout_bytes: int = 0
     stderr_bytes: int = 0
     sequence: int = 0
@@ -45,6 +46,30 @@ class RunningScript:
 # Callback type for streaming output
 OutputCallback = Callable[[str, str], None]  # (stream_name, data)
 
+# Most output buffers kept for reuse between runs
+BUFFER_POOL_SIZE = 8
+
+# Output is read from the pipes in chunks of up to this many bytes
+STREAM_READ_SIZE = 65536
+
+# Step progress marker, matched against raw output lines
+_STEP_RE = re.compile(rb'\[Step\s+(\d+)/(\d+)\]')
+
+
+def _write_script_file(path: str, content: str) -> None:
+    """Write a script to an owner-only executable file.
+
+    The mode is set at creation, and O_CLOEXEC keeps the descriptor from
+    leaking into concurrently spawned scripts.
+    """
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o700)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
 
 class ScriptExecutor(BaseSubagent[ExecutionResult]):
     """Executes shell scripts with streaming output.
@@ -66,8 +91,10 @@ class ScriptExecutor(BaseSubagent[ExecutionResult]):
         super().__init__("ScriptExecutor")
         self.shell = shell
         self.running_scripts: dict[str, RunningScript] = {}
+        self._buffer_pool: deque[bytearray] = deque(maxlen=BUFFER_POOL_SIZE)
         self._temp_dir = Path(tempfile.gettempdir()) / "nlsh_scripts"
         self._temp_dir.mkdir(exist_ok=True)
+        self._temp_dir_str = str(self._temp_dir)
 
     async def process(
         self,
@@ -124,22 +151,22 @@ class ScriptExecutor(BaseSubagent[ExecutionResult]):
         Returns:
             ExecutionResult with execution details
         """
-        # Create temporary script file
-        temp_file = self._temp_dir / f"{script_id}.sh"
-        temp_file.write_text(script_content)
-        temp_file.chmod(0o700)
+        # Create temporary script file. Scripts are never passed in argv,
+        # where any local user could read them through ps or /proc.
+        temp_file = f"{self._temp_dir_str}/{script_id}.sh"
+        # Off the event loop: large writes can stall other tasks
+        await asyncio.to_thread(_write_script_file, temp_file, script_content)
 
-        # Prepare environment
-        process_env = os.environ.copy()
-        if env:
-            process_env.update(env)
+        # Prepare environment; without extras the child simply inherits ours
+        process_env = {**os.environ, **env} if env else None
 
         # Determine working directory
         work_dir = cwd if cwd and os.path.isdir(cwd) else os.getcwd()
 
         start_time = time.time()
-        stdout_buffer: list[str] = []
-        stderr_buffer: list[str] = []
+        # Raw output is collected as bytes and decoded once at the end
+        stdout_buf = self._acquire_buf()
+        stderr_buf = self._acquire_buf()
         steps_completed = 0
         error_message: str | None = None
 
@@ -147,7 +174,7 @@ class ScriptExecutor(BaseSubagent[ExecutionResult]):
             # Start process
             process = await asyncio.create_subprocess_exec(
                 self.shell,
-                str(temp_file),
+                temp_file,
                 cwd=work_dir,
                 env=process_env,
                 stdout=asyncio.subprocess.PIPE,
@@ -161,53 +188,88 @@ class ScriptExecutor(BaseSubagent[ExecutionResult]):
                 process=process,
                 temp_file=temp_file,
                 start_time=start_time,
+                stdout_buf=stdout_buf,
+                stderr_buf=stderr_buf,
                 total_steps=total_steps,
             )
             self.running_scripts[script_id] = running
 
-            # Stream output
-            async def stream_output(
-                stream: asyncio.StreamReader,
-                stream_name: str,
-                buffer: list[str],
-            ):
+            def handle_lines(stream_name: str, block: bytes | bytearray):
                 nonlocal steps_completed
-                while True:
-                    line = await stream.readline()
-                    if not line:
-                        break
-                    data = line.decode('utf-8', errors='replace')
-                    buffer.append(data)
+                if not on_output:
+                    # No per-line work: one pass over the whole block, and
+                    # only the last marker in it matters
+                    step_match = None
+                    for step_match in _STEP_RE.finditer(block):
+                        pass
+                    if step_match:
+                        steps_completed = int(step_match.group(1))
+                        running.steps_completed = steps_completed
+                    return
+                start, size = 0, len(block)
+                while start < size:
+                    end = block.find(b"\n", start) + 1 or size
+                    line = block[start:end]
+                    start = end
 
                     # Track step progress from log markers
-                    step_match = re.search(r'\[Step\s+(\d+)/(\d+)\]', data)
+                    step_match = _STEP_RE.search(line)
                     if step_match:
                         steps_completed = int(step_match.group(1))
                         running.steps_completed = steps_completed
 
-                    # Call output callback
+                    # Call output callback; lines are only decoded for it
                     if on_output:
-                        on_output(stream_name, data)
+                        on_output(stream_name, line.decode('utf-8', errors='replace'))
 
-            # Run both stream readers concurrently with timeout
+            # Stream output
+            async def stream_output(
+                stream: asyncio.StreamReader,
+                stream_name: str,
+                buf: bytearray,
+            ):
+                # Read in large chunks and split lines locally; pending
+                # holds output up to the last complete line seen so far
+                pending = bytearray()
+                while True:
+                    chunk = await stream.read(STREAM_READ_SIZE)
+                    if not chunk:
+                        break
+                    buf += chunk
+                    end = chunk.rfind(b"\n") + 1
+                    if not end:
+                        pending += chunk
+                        continue
+                    pending += chunk[:end]
+                    handle_lines(stream_name, pending)
+                    pending = bytearray(chunk[end:])
+                if pending:
+                    handle_lines(stream_name, pending)
+
+            # Wait for both stream readers and the exit together, with timeout
+            tasks = [
+                asyncio.create_task(stream_output(process.stdout, "stdout", stdout_buf)),
+                asyncio.create_task(stream_output(process.stderr, "stderr", stderr_buf)),
+                asyncio.create_task(process.wait()),
+            ]
             try:
-                await asyncio.wait_for(
-                    asyncio.gather(
-                        stream_output(process.stdout, "stdout", stdout_buffer),
-                        stream_output(process.stderr, "stderr", stderr_buffer),
-                    ),
-                    timeout=timeout,
-                )
-                await process.wait()
-                returncode = process.returncode
-                running.status = ExecutionStatus.COMPLETED
+                done, pending = await asyncio.wait(tasks, timeout=timeout)
+            finally:
+                # Stops whatever is still running on timeout or cancellation
+                for task in tasks:
+                    task.cancel()
 
-            except asyncio.TimeoutError:
+            if pending:
                 # Kill process group on timeout
                 await self._kill_process(process)
                 returncode = -9
                 error_message = f"Script timed out after {timeout}s"
                 running.status = ExecutionStatus.FAILED
+            else:
+                for task in done:
+                    task.result()  # Re-raise reader errors
+                returncode = process.returncode
+                running.status = ExecutionStatus.COMPLETED
 
             duration = time.time() - start_time
 
@@ -216,8 +278,8 @@ class ScriptExecutor(BaseSubagent[ExecutionResult]):
                 returncode=returncode,
                 success=(returncode == 0 and error_message is None),
                 duration_seconds=duration,
-                stdout="".join(stdout_buffer),
-                stderr="".join(stderr_buffer),
+                stdout=stdout_buf.decode('utf-8', errors='replace'),
+                stderr=stderr_buf.decode('utf-8', errors='replace'),
                 steps_completed=steps_completed,
                 total_steps=total_steps,
                 error_message=error_message,
@@ -226,11 +288,22 @@ class ScriptExecutor(BaseSubagent[ExecutionResult]):
         finally:
             # Cleanup
             self.running_scripts.pop(script_id, None)
+            self._release_buf(stdout_buf)
+            self._release_buf(stderr_buf)
             try:
-                temp_file.unlink()
+                await asyncio.to_thread(os.unlink, temp_file)
             except OSError:
                 pass
 
+    def _acquire_buf(self) -> bytearray:
+        """Get an empty output buffer, reusing a released one if possible."""
+        return self._buffer_pool.pop() if self._buffer_pool else bytearray()
+
+    def _release_buf(self, buf: bytearray) -> None:
+        """Clear an output buffer and return it to the pool."""
+        buf.clear()
+        self._buffer_pool.append(buf)
+
     async def cancel_script(
         self,
         script_id: str,
@@ -251,13 +324,13 @@ class ScriptExecutor(BaseSubagent[ExecutionResult]):
 
         running.status = ExecutionStatus.CANCELLED
 
+        # Snapshot output first: the buffers are recycled once the run ends
+        partial_stdout = running.stdout_buf.decode('utf-8', errors='replace')
+        partial_stderr = running.stderr_buf.decode('utf-8', errors='replace')
+
         await self._kill_process(running.process, sig)
 
-        return (
-            True,
-            "".join(running.stdout_buffer),
-            "".join(running.stderr_buffer),
-        )
+        return True, partial_stdout, partial_stderr
 
     async def _kill_process(
         self,
@@ -2,6 +2,7 @@
 
 import json
 import re
+from contextlib import aclosing
 from typing import Any
 
 from subagents.base import BaseSubagent
@@ -12,6 +13,56 @@ from script_types import (
 )
 
 
+# Reused to decode the JSON object embedded in LLM responses
+_json_decoder = json.JSONDecoder()
+
+# Characters that can change JSON nesting or string state
+_JSON_STRUCTURAL = re.compile(r'[{}"\\]')
+
+
+class _JsonObjectScanner:
+    """Detects when the first JSON object in streamed text is complete.
+
+    Text is fed in chunks as it arrives; braces inside strings and
+    escaped quotes are skipped, so only real object nesting is counted.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.offset = 0       # Total length of text fed so far
+        self.skip_pos = -1    # Position of a backslash-escaped character
+
+    def feed(self, text: str) -> bool:
+        """Scan the next chunk of text.
+
+        Returns:
+            True once the first top-level object has been closed
+        """
+        base = self.offset
+        self.offset += len(text)
+        for match in _JSON_STRUCTURAL.finditer(text):
+            pos = base + match.start()
+            if pos == self.skip_pos:
+                continue
+            char = match.group()
+            if self.in_string:
+                if char == '"':
+                    self.in_string = False
+                elif char == '\\':
+                    self.skip_pos = pos + 1
+            elif char == '{':
+                self.depth += 1
+            elif self.depth == 0:
+                continue  # Nothing counts before the object starts
+            elif char == '"':
+                self.in_string = True
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
 # Script template with best practices
 SCRIPT_TEMPLATE = '''#!/usr/bin/env bash
 set -euo pipefail
@@ -84,6 +135,11 @@ Shell: bash
 Mode: {mode}
 '''
 
+# The constant part of the prompt, before the per-request context. The
+# prompt's literal braces (JSON example, ${VAR:-...}) make .format()
+# unusable on the whole template, so only the tail is filled in.
+_PROMPT_HEAD = SCRIPT_GENERATION_PROMPT[:SCRIPT_GENERATION_PROMPT.index("## Context")]
+
 
 class ScriptGenerator(BaseSubagent[GeneratedScript]):
     """Generates shell scripts from natural language requests.
@@ -124,9 +180,11 @@ class ScriptGenerator(BaseSubagent[GeneratedScript]):
         mode = "remote" if is_remote else "local"
 
         # Build the prompt
-        system_prompt = SCRIPT_GENERATION_PROMPT.format(
-            cwd=cwd,
-            mode=mode,
+        system_prompt = (
+            f"{_PROMPT_HEAD}## Context\n"
+            f"Working directory: {cwd}\n"
+            f"Shell: bash\n"
+            f"Mode: {mode}\n"
         )
 
         user_prompt = f"Generate a shell script for: {request}"
@@ -149,6 +207,10 @@ class ScriptGenerator(BaseSubagent[GeneratedScript]):
     async def _call_llm(self, messages: list[dict]) -> str:
         """Call the LLM and return the response text.
 
+        The response is streamed, and the stream is closed as soon as the
+        first JSON object in it is complete, so trailing commentary is
+        neither waited for nor generated.
+
         Args:
             messages: List of message dicts with role and content
 
@@ -165,8 +227,16 @@ class ScriptGenerator(BaseSubagent[GeneratedScript]):
             else:
                 lc_messages.append(HumanMessage(content=msg["content"]))
 
-        result = await self.llm.ainvoke(lc_messages)
-        return result.content
+        parts = []
+        scanner = _JsonObjectScanner()
+        # aclosing() shuts the stream (and the provider's request) down
+        # right away on break, rather than whenever it is garbage-collected
+        async with aclosing(self.llm.astream(lc_messages)) as stream:
+            async for chunk in stream:
+                parts.append(chunk.content)
+                if scanner.feed(chunk.content):
+                    break
+        return "".join(parts)
 
     def _parse_response(self, response: str) -> GeneratedScript:
         """Parse the LLM response into a GeneratedScript.
@@ -180,13 +250,14 @@ class ScriptGenerator(BaseSubagent[GeneratedScript]):
         Raises:
             ValueError: If the response cannot be parsed
         """
-        # Try to extract JSON from the response
-        json_match = re.search(r'\{[\s\S]*\}', response)
-        if not json_match:
+        # Decode the JSON object starting at the first brace; any text
+        # after it is ignored
+        start = response.find('{')
+        if start < 0:
             raise ValueError(f"No JSON found in response: {response[:200]}")
 
         try:
-            data = json.loads(json_match.group())
+            data, _ = _json_decoder.raw_decode(response, start)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in response: {e}")
 
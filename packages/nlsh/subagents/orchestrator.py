@@ -1,5 +1,6 @@
 """ScriptOrchestrator - coordinates the script workflow between subagents."""
 
+import asyncio
 from typing import Any, Callable
 
 from subagents.generator import ScriptGenerator
@@ -31,8 +32,16 @@ class ScriptOrchestrator:
     2. Review script for safety
     3. Display to user and get confirmation
     4. Execute with streaming output
+
+    The reviewer and executors are shared by all orchestrators in the
+    process (one executor per shell), so constructing an orchestrator per
+    request doesn't recreate them.
     """
 
+    # Shared subagents, created on first use
+    _reviewer: ScriptReviewer | None = None
+    _executors: dict[str, ScriptExecutor] = {}
+
     def __init__(
         self,
         llm: Any,
@@ -45,8 +54,16 @@ class ScriptOrchestrator:
             shell: Shell interpreter for execution
         """
         self.generator = ScriptGenerator(llm)
-        self.reviewer = ScriptReviewer()
-        self.executor = ScriptExecutor(shell)
+
+        cls = type(self)
+        if cls._reviewer is None:
+            cls._reviewer = ScriptReviewer()
+        self.reviewer = cls._reviewer
+
+        executor = cls._executors.get(shell)
+        if executor is None:
+            executor = cls._executors[shell] = ScriptExecutor(shell)
+        self.executor = executor
 
     async def process_request(
         self,
@@ -92,9 +109,12 @@ class ScriptOrchestrator:
         if state.review_result and not state.review_result.approved:
             return state, None
 
-        # Phase 3: Get user confirmation (if callback provided)
+        # Phase 3: Get user confirmation (if callback provided). The callback
+        # blocks on user input, so it runs in a thread to keep the event
+        # loop serving other tasks meanwhile.
         if confirm_callback:
-            approved, feedback = confirm_callback(
+            approved, feedback = await asyncio.to_thread(
+                confirm_callback,
                 state.generated_script,
                 state.review_result,
             )
@@ -108,7 +128,8 @@ class ScriptOrchestrator:
                 if state.generated_script:
                     state = await self._review_phase(state)
                     if state.review_result and state.review_result.approved:
-                        approved, feedback = confirm_callback(
+                        approved, feedback = await asyncio.to_thread(
+                            confirm_callback,
                             state.generated_script,
                             state.review_result,
                         )
@@ -8,7 +8,6 @@ This module provides a singleton connection manager that:
 """
 
 import asyncio
-import json
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, Union
@@ -25,6 +24,7 @@ from shared.asymmetric_crypto import (
     verify_message,
     load_public_key,
 )
+from shared.serialization import encode_frame, decode_message
 from shared.protocol import (
     MessageType,
     CommandRequest, CommandResponse,
@@ -151,8 +151,11 @@ class RemoteConnectionManager:
                 return True
 
             try:
+                # No per-message deflate (file payloads are base64 and the
+                # tunnel is local) and no frame size cap (uploads/downloads
+                # carry whole files)
                 self._websocket = await asyncio.wait_for(
-                    websockets.connect(self._ws_url),
+                    websockets.connect(self._ws_url, compression=None, max_size=None),
                     timeout=self._config.connection_timeout
                 )
                 self._connected = True
@@ -227,12 +230,12 @@ class RemoteConnectionManager:
 
         effective_timeout = timeout or self._config.connection_timeout
 
-        await self._websocket.send(json.dumps(message))
+        await self._websocket.send(encode_frame(message))
         response_text = await asyncio.wait_for(
             self._websocket.recv(),
             timeout=effective_timeout
         )
-        response = json.loads(response_text)
+        response = decode_message(response_text)
 
         # Note: In the current implementation, we don't verify the response signature
         # because nlsh_remote uses HMAC. After nlsh_remote is updated to Ed25519,
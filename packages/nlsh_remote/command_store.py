@@ -78,6 +78,40 @@ class CommandStore:
 
         return None
 
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Look up several commands with one query per batch of keys.
+
+        Args:
+            keys: UUID keys
+
+        Returns:
+            Mapping of found keys to their commands (missing keys are omitted).
+        """
+        conn = self._get_conn()
+        found: dict[str, str] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(unique_keys), 500):
+            batch = unique_keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            cursor = conn.execute(
+                f"SELECT key, command FROM commands WHERE key IN ({placeholders})",
+                batch
+            )
+            found.update(cursor.fetchall())
+
+        if found:
+            # Update usage statistics
+            now = datetime.now().isoformat()
+            conn.executemany(
+                "UPDATE commands SET last_used = ?, use_count = use_count + 1 WHERE key = ?",
+                [(now, key) for key in found]
+            )
+            conn.commit()
+
+        return found
+
     def put(self, key: str, command: str) -> bool:
         """Store a command with the given key.
 
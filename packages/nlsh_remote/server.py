@@ -15,11 +15,12 @@ Security: Use SSH tunnel for secure access (recommended over SSL).
 
 import os
 import sys
-import json
 import asyncio
 import subprocess
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Union
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from dotenv import load_dotenv
@@ -36,13 +37,15 @@ except ImportError:
     from shared.crypto import verify_message
     USE_ASYMMETRIC = False
 
+from shared.serialization import encode_frame, encode_frame_with_body, decode_frame
 from shared.protocol import (
     MessageType,
     CommandRequest, CommandResponse,
-    UploadRequest, UploadResponse,
-    DownloadRequest, DownloadResponse,
+    UploadRequest, UploadResponse, UploadBeginRequest, UploadChunk,
+    DownloadRequest, DownloadResponse, DownloadChunk,
     ErrorResponse,
     CacheLookupRequest, CacheLookupResponse,
+    CacheLookupBatchRequest, CacheLookupBatchResponse,
     CacheStoreExecRequest,
     ScriptRequest, ScriptOutputChunk, ScriptCompleteResponse,
     ScriptCancelRequest, ScriptCancelledResponse,
@@ -53,6 +56,9 @@ from script_executor import get_script_executor
 # Load environment variables
 load_dotenv()
 
+# Request correlation id: integer "rid", or legacy "request_id" string
+RequestId = Union[int, str]
+
 # Configuration
 HOST = os.getenv("NLSH_REMOTE_HOST", "127.0.0.1")  # localhost by default (use SSH tunnel)
 PORT = int(os.getenv("NLSH_REMOTE_PORT", "8765"))
@@ -101,6 +107,40 @@ def send_error(error: str, code: str = "ERROR") -> Dict[str, Any]:
     return send_response(MessageType.ERROR, response.to_payload())
 
 
+async def send_frame(websocket: WebSocket, message: Dict[str, Any]) -> None:
+    """Send a message as a binary frame of UTF-8 JSON.
+
+    Binary frames let clients skip the per-frame UTF-8 validation that
+    text frames require; the JSON itself is unchanged.
+    """
+    await websocket.send_bytes(encode_frame(message))
+
+
+def get_request_id(message: Dict[str, Any]) -> Optional[RequestId]:
+    """Get a request's correlation id.
+
+    Clients send an integer "rid"; older clients send a "request_id" string.
+    """
+    rid = message.get("rid")
+    return rid if rid is not None else message.get("request_id")
+
+
+def tag_response(response: Dict[str, Any], request_id: Optional[RequestId]) -> Dict[str, Any]:
+    """Echo the client's correlation id so it can match responses to requests.
+
+    Clients that multiplex several requests over one connection rely on
+    this. The id goes back under the key it came in: "rid" for integer ids,
+    "request_id" for strings. Requests without one get untagged responses.
+    """
+    if request_id is None:
+        return response
+    if isinstance(request_id, int):
+        response["rid"] = request_id
+    else:
+        response["request_id"] = request_id
+    return response
+
+
 async def handle_command(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Handle command execution request."""
     try:
@@ -176,6 +216,151 @@ async def handle_upload(payload: Dict[str, Any]) -> Dict[str, Any]:
         return send_error(f"Upload failed: {e}", "UPLOAD_ERROR")
 
 
+@dataclass
+class ChunkedUpload:
+    """A chunked upload in progress on one connection.
+
+    Data goes to temp_path, a temporary file next to path, which replaces
+    path only once the whole file has arrived; an existing file at path is
+    left untouched until then.
+    """
+    path: Path
+    temp_path: Path
+    size: int
+    mode: str
+    file: Any
+    written: int = 0
+
+    def abort(self) -> None:
+        """Close and remove the partially written temporary file."""
+        self.file.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+async def handle_upload_begin(
+    uploads: Dict[Optional[RequestId], Optional[ChunkedUpload]],
+    payload: Dict[str, Any],
+    request_id: Optional[RequestId]
+) -> Optional[Dict[str, Any]]:
+    """Handle the start of a chunked upload.
+
+    Opens a temporary file beside the target and records the upload in
+    uploads under request_id. A
+    successful begin gets no reply; the response comes after the last chunk.
+    On failure the upload is recorded as None so its chunks are dropped.
+
+    Returns:
+        An error response, or None on success
+    """
+    previous = uploads.pop(request_id, None)
+    if previous is not None:
+        previous.abort()
+
+    try:
+        request = UploadBeginRequest.from_payload(payload)
+    except (KeyError, TypeError) as e:
+        uploads[request_id] = None
+        return send_error(f"Invalid upload request: {e}", "INVALID_REQUEST")
+
+    try:
+        remote_path = Path(request.remote_path).expanduser().resolve()
+        await asyncio.to_thread(remote_path.parent.mkdir, parents=True, exist_ok=True)
+        fd, temp_name = await asyncio.to_thread(
+            tempfile.mkstemp, dir=remote_path.parent, prefix=f".{remote_path.name}.", suffix=".part"
+        )
+        f = os.fdopen(fd, "wb")
+    except PermissionError:
+        uploads[request_id] = None
+        return send_error(f"Permission denied: {request.remote_path}", "PERMISSION_DENIED")
+    except Exception as e:
+        uploads[request_id] = None
+        return send_error(f"Upload failed: {e}", "UPLOAD_ERROR")
+
+    uploads[request_id] = ChunkedUpload(
+        path=remote_path, temp_path=Path(temp_name),
+        size=request.size, mode=request.mode, file=f
+    )
+    return None
+
+
+async def handle_upload_chunk(
+    uploads: Dict[Optional[RequestId], Optional[ChunkedUpload]],
+    payload: Dict[str, Any],
+    request_id: Optional[RequestId],
+    body: Optional[memoryview] = None
+) -> Optional[Dict[str, Any]]:
+    """Handle one chunk of a chunked upload.
+
+    The chunk data is either the binary frame's body (checked against the
+    signed header's digest) or base64 in the payload.
+
+    Returns:
+        The upload response after the eof chunk, an error response, or
+        None while more chunks are expected
+    """
+    if request_id not in uploads:
+        return send_error("No upload in progress", "INVALID_REQUEST")
+
+    try:
+        if body is None:
+            chunk = UploadChunk.from_payload(payload)
+        else:
+            chunk = UploadChunk.from_header_payload(payload, body)
+    except (KeyError, TypeError, ValueError) as e:
+        upload = uploads.pop(request_id)
+        if upload is not None:
+            upload.abort()
+        return send_error(f"Invalid upload chunk: {e}", "INVALID_REQUEST")
+
+    upload = uploads[request_id]
+    if upload is None:
+        # Already failed and reported; drop the rest of the file
+        if chunk.eof:
+            del uploads[request_id]
+        return None
+
+    try:
+        if chunk.offset != upload.written:
+            raise ValueError(f"expected offset {upload.written}, got {chunk.offset}")
+        if chunk.data:
+            await asyncio.to_thread(upload.file.write, chunk.data)
+            upload.written += len(chunk.data)
+        if not chunk.eof:
+            return None
+
+        del uploads[request_id]
+        if upload.written != upload.size:
+            upload.abort()
+            return send_error(
+                f"Upload incomplete: got {upload.written} of {upload.size} bytes",
+                "UPLOAD_ERROR"
+            )
+        await asyncio.to_thread(upload.file.close)
+
+        try:
+            os.chmod(upload.temp_path, int(upload.mode, 8))
+        except (ValueError, OSError):
+            pass  # Ignore permission errors
+
+        # Only now does the upload replace any existing file
+        await asyncio.to_thread(os.replace, upload.temp_path, upload.path)
+
+        response = UploadResponse(
+            success=True,
+            message=f"File written to {upload.path}",
+            bytes_written=upload.written
+        )
+        return send_response(MessageType.RESPONSE, response.to_payload())
+
+    except Exception as e:
+        upload.abort()
+        if chunk.eof:
+            uploads.pop(request_id, None)
+        else:
+            uploads[request_id] = None
+        return send_error(f"Upload failed: {e}", "UPLOAD_ERROR")
+
+
 async def handle_download(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Handle file download request."""
     try:
@@ -210,6 +395,87 @@ async def handle_download(payload: Dict[str, Any]) -> Dict[str, Any]:
         return send_error(f"Download failed: {e}", "DOWNLOAD_ERROR")
 
 
+async def handle_download_stream(
+    websocket: WebSocket,
+    payload: Dict[str, Any],
+    request_id: Optional[RequestId] = None
+) -> None:
+    """Handle a chunked file download.
+
+    Streams the file as DOWNLOAD_CHUNK messages of at most chunk_size bytes;
+    the last one has eof set. Memory use is bounded by one chunk. Binary
+    requests get the raw chunk bytes as a frame body instead of base64.
+    """
+    try:
+        request = DownloadRequest.from_payload(payload)
+    except (KeyError, TypeError) as e:
+        await send_frame(websocket, tag_response(
+            send_error(f"Invalid download request: {e}", "INVALID_REQUEST"),
+            request_id
+        ))
+        return
+
+    try:
+        remote_path = Path(request.remote_path).expanduser().resolve()
+
+        if not remote_path.exists():
+            error = send_error(f"File not found: {request.remote_path}", "FILE_NOT_FOUND")
+        elif not remote_path.is_file():
+            error = send_error(f"Not a file: {request.remote_path}", "NOT_A_FILE")
+        else:
+            error = None
+        if error:
+            await send_frame(websocket, tag_response(error, request_id))
+            return
+
+        f = await asyncio.to_thread(open, remote_path, "rb")
+    except PermissionError:
+        await send_frame(websocket, tag_response(
+            send_error(f"Permission denied: {request.remote_path}", "PERMISSION_DENIED"),
+            request_id
+        ))
+        return
+    except Exception as e:
+        await send_frame(websocket, tag_response(
+            send_error(f"Download failed: {e}", "DOWNLOAD_ERROR"),
+            request_id
+        ))
+        return
+
+    try:
+        offset = 0
+        chunk_data = await asyncio.to_thread(f.read, request.chunk_size)
+        while True:
+            # Read one chunk ahead so the final frame can carry eof
+            next_data = await asyncio.to_thread(f.read, request.chunk_size) if chunk_data else b""
+            chunk = DownloadChunk(offset=offset, data=chunk_data, eof=not next_data)
+            if request.binary:
+                if request.compress:
+                    header_payload, body = await asyncio.to_thread(chunk.to_header_and_body, True)
+                else:
+                    header_payload, body = chunk.to_header_payload(), chunk.data
+                header = send_response(MessageType.DOWNLOAD_CHUNK, header_payload)
+                await websocket.send_bytes(
+                    encode_frame_with_body(tag_response(header, request_id), body)
+                )
+            else:
+                await send_frame(websocket, tag_response(
+                    send_response(MessageType.DOWNLOAD_CHUNK, chunk.to_payload()),
+                    request_id
+                ))
+            if chunk.eof:
+                break
+            offset += len(chunk_data)
+            chunk_data = next_data
+    except Exception as e:
+        await send_frame(websocket, tag_response(
+            send_error(f"Download failed: {e}", "DOWNLOAD_ERROR"),
+            request_id
+        ))
+    finally:
+        f.close()
+
+
 async def handle_ping() -> Dict[str, Any]:
     """Handle ping request."""
     return send_response(MessageType.PONG, {"status": "ok"})
@@ -233,6 +499,23 @@ async def handle_cache_lookup(payload: Dict[str, Any]) -> Dict[str, Any]:
         return send_response(MessageType.CACHE_MISS, response.to_payload())
 
 
+async def handle_cache_lookup_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle batch cache lookup request."""
+    try:
+        request = CacheLookupBatchRequest.from_payload(payload)
+    except (KeyError, TypeError) as e:
+        return send_error(f"Invalid cache lookup batch request: {e}", "INVALID_REQUEST")
+
+    store = get_command_store()
+    found = store.get_many(request.keys)
+
+    response = CacheLookupBatchResponse(results=[
+        CacheLookupResponse(hit=key in found, key=key, command=found.get(key))
+        for key in request.keys
+    ])
+    return send_response(MessageType.CACHE_BATCH_RESULT, response.to_payload())
+
+
 async def handle_cache_store_exec(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Handle cache store and execute request."""
     try:
@@ -258,17 +541,23 @@ async def handle_cache_store_exec(payload: Dict[str, Any]) -> Dict[str, Any]:
     return await handle_command(command_request.to_payload())
 
 
-async def handle_script(websocket: WebSocket, payload: Dict[str, Any]) -> None:
+async def handle_script(
+    websocket: WebSocket,
+    payload: Dict[str, Any],
+    request_id: Optional[RequestId] = None
+) -> None:
     """Handle script execution with streaming output.
 
     This handler is special - it sends multiple messages (streaming output)
-    before the final completion message.
+    before the final completion message. Every message carries the
+    request's request_id.
     """
     try:
         request = ScriptRequest.from_payload(payload)
     except (KeyError, TypeError) as e:
-        await websocket.send_text(json.dumps(
-            send_error(f"Invalid script request: {e}", "INVALID_REQUEST")
+        await send_frame(websocket, tag_response(
+            send_error(f"Invalid script request: {e}", "INVALID_REQUEST"),
+            request_id
         ))
         return
 
@@ -282,8 +571,9 @@ async def handle_script(websocket: WebSocket, payload: Dict[str, Any]) -> None:
             data=data,
             sequence=seq,
         )
-        await websocket.send_text(json.dumps(
-            send_response(MessageType.SCRIPT_OUTPUT, chunk.to_payload())
+        await send_frame(websocket, tag_response(
+            send_response(MessageType.SCRIPT_OUTPUT, chunk.to_payload()),
+            request_id
         ))
 
     # Execute with streaming
@@ -307,8 +597,9 @@ async def handle_script(websocket: WebSocket, payload: Dict[str, Any]) -> None:
         total_stderr_bytes=stderr_bytes,
         error_message=error_msg,
     )
-    await websocket.send_text(json.dumps(
-        send_response(MessageType.SCRIPT_COMPLETE, complete.to_payload())
+    await send_frame(websocket, tag_response(
+        send_response(MessageType.SCRIPT_COMPLETE, complete.to_payload()),
+        request_id
     ))
 
 
@@ -334,74 +625,133 @@ async def handle_script_cancel(payload: Dict[str, Any]) -> Dict[str, Any]:
     return send_response(MessageType.SCRIPT_CANCELLED, response.to_payload())
 
 
+async def handle_message(
+    websocket: WebSocket,
+    message: Dict[str, Any],
+    uploads: Dict[Optional[RequestId], Optional[ChunkedUpload]],
+    client_info: str,
+    body: Optional[memoryview] = None
+) -> None:
+    """Verify one request, dispatch it by type and send its response(s).
+
+    body is the raw data that followed the request header in a binary
+    frame (only upload chunks carry one).
+    """
+    # Correlation id, echoed on every response (outside the signature)
+    request_id = get_request_id(message)
+
+    # Verify signature
+    if USE_ASYMMETRIC:
+        # Ed25519 verification with MCP public key
+        is_valid, error = verify_message(MCP_PUBLIC_KEY, message)
+    else:
+        # Legacy HMAC verification
+        is_valid, error = verify_message(SHARED_SECRET, message)
+
+    if not is_valid:
+        print(f"[-] Auth failed from {client_info}: {error}")
+        await send_frame(websocket, tag_response(
+            send_error(f"Authentication failed: {error}", "AUTH_FAILED"),
+            request_id
+        ))
+        return
+
+    # Handle message based on type
+    msg_type = message.get("type")
+    payload = message.get("payload", {})
+
+    if msg_type != MessageType.UPLOAD_CHUNK:
+        print(f"[>] {client_info}: {msg_type}")
+
+    if msg_type == MessageType.COMMAND:
+        response = await handle_command(payload)
+    elif msg_type == MessageType.UPLOAD:
+        response = await handle_upload(payload)
+    elif msg_type == MessageType.UPLOAD_BEGIN:
+        response = await handle_upload_begin(uploads, payload, request_id)
+        if response is None:
+            return
+    elif msg_type == MessageType.UPLOAD_CHUNK:
+        response = await handle_upload_chunk(uploads, payload, request_id, body)
+        if response is None:
+            return
+    elif msg_type == MessageType.DOWNLOAD:
+        if payload.get("chunk_size"):
+            # Chunked download streams several messages
+            await handle_download_stream(websocket, payload, request_id)
+            return
+        response = await handle_download(payload)
+    elif msg_type == MessageType.PING:
+        response = await handle_ping()
+    elif msg_type == MessageType.CACHE_LOOKUP:
+        response = await handle_cache_lookup(payload)
+    elif msg_type == MessageType.CACHE_LOOKUP_BATCH:
+        response = await handle_cache_lookup_batch(payload)
+    elif msg_type == MessageType.CACHE_STORE_EXEC:
+        response = await handle_cache_store_exec(payload)
+    elif msg_type == MessageType.SCRIPT:
+        # Script execution sends multiple responses (streaming)
+        await handle_script(websocket, payload, request_id)
+        return  # Don't send a single response
+    elif msg_type == MessageType.SCRIPT_CANCEL:
+        response = await handle_script_cancel(payload)
+    else:
+        response = send_error(f"Unknown message type: {msg_type}", "UNKNOWN_TYPE")
+
+    # Send response
+    await send_frame(websocket, tag_response(response, request_id))
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for nlsh clients."""
+    """WebSocket endpoint for nlsh clients.
+
+    A frame holds one request, or a JSON array of requests that the client
+    coalesced into one frame; batched requests are handled in order. A
+    binary frame may carry a request header followed by a raw body (see
+    encode_frame_with_body()).
+    """
     await websocket.accept()
     client_info = f"{websocket.client.host}:{websocket.client.port}" if websocket.client else "unknown"
     print(f"[+] Client connected: {client_info}")
 
+    # Chunked uploads in progress on this connection, by request_id
+    uploads: Dict[Optional[RequestId], Optional[ChunkedUpload]] = {}
+
     try:
         while True:
             # Receive message
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            data = frame.get("text")
+            if data is None:
+                data = frame.get("bytes") or b""
             try:
-                data = await websocket.receive_text()
-                message = json.loads(data)
-            except json.JSONDecodeError:
-                await websocket.send_text(json.dumps(
-                    send_error("Invalid JSON", "PARSE_ERROR")
-                ))
+                message, body = decode_frame(data)
+            except ValueError:  # Not JSON, or not UTF-8
+                await send_frame(websocket, send_error("Invalid JSON", "PARSE_ERROR"))
                 continue
 
-            # Verify signature
-            if USE_ASYMMETRIC:
-                # Ed25519 verification with MCP public key
-                is_valid, error = verify_message(MCP_PUBLIC_KEY, message)
-            else:
-                # Legacy HMAC verification
-                is_valid, error = verify_message(SHARED_SECRET, message)
-
-            if not is_valid:
-                print(f"[-] Auth failed from {client_info}: {error}")
-                await websocket.send_text(json.dumps(
-                    send_error(f"Authentication failed: {error}", "AUTH_FAILED")
-                ))
+            if body is not None and isinstance(message, dict):
+                await handle_message(websocket, message, uploads, client_info, body)
                 continue
 
-            # Handle message based on type
-            msg_type = message.get("type")
-            payload = message.get("payload", {})
-
-            print(f"[>] {client_info}: {msg_type}")
-
-            if msg_type == MessageType.COMMAND:
-                response = await handle_command(payload)
-            elif msg_type == MessageType.UPLOAD:
-                response = await handle_upload(payload)
-            elif msg_type == MessageType.DOWNLOAD:
-                response = await handle_download(payload)
-            elif msg_type == MessageType.PING:
-                response = await handle_ping()
-            elif msg_type == MessageType.CACHE_LOOKUP:
-                response = await handle_cache_lookup(payload)
-            elif msg_type == MessageType.CACHE_STORE_EXEC:
-                response = await handle_cache_store_exec(payload)
-            elif msg_type == MessageType.SCRIPT:
-                # Script execution sends multiple responses (streaming)
-                await handle_script(websocket, payload)
-                continue  # Don't send a single response
-            elif msg_type == MessageType.SCRIPT_CANCEL:
-                response = await handle_script_cancel(payload)
-            else:
-                response = send_error(f"Unknown message type: {msg_type}", "UNKNOWN_TYPE")
-
-            # Send response
-            await websocket.send_text(json.dumps(response))
+            for request in message if isinstance(message, list) else (message,):
+                if not isinstance(request, dict):
+                    await send_frame(websocket, send_error("Invalid message", "PARSE_ERROR"))
+                    continue
+                await handle_message(websocket, request, uploads, client_info)
 
     except WebSocketDisconnect:
         print(f"[-] Client disconnected: {client_info}")
     except Exception as e:
         print(f"[!] Error with {client_info}: {e}")
+    finally:
+        # Don't leave half-written files behind a dropped connection
+        for upload in uploads.values():
+            if upload is not None:
+                upload.abort()
 
 
 @app.get("/health")
@@ -449,7 +799,9 @@ def main():
         print(f"  Network: localhost only (use SSH tunnel)")
     print()
 
-    uvicorn.run(app, host=HOST, port=PORT, log_level="warning")
+    # No permessage-deflate: payloads are mostly base64 blobs and script
+    # output where zlib costs more CPU than it saves on an SSH tunnel
+    uvicorn.run(app, host=HOST, port=PORT, log_level="warning", ws_per_message_deflate=False)
 
 
 if __name__ == "__main__":
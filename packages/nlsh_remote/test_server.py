@@ -0,0 +1,190 @@
+"""Unit tests for nlsh_remote chunked upload and download handling."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from shared import serialization
+from shared.asymmetric_crypto import generate_keypair, sign_message
+from shared.protocol import (
+    MessageType,
+    UploadBeginRequest, UploadChunk,
+    DownloadRequest, DownloadChunk,
+)
+
+
+@pytest.fixture
+def private_key(monkeypatch):
+    """Generate a signing key the server trusts for the test."""
+    private_key, public_key = generate_keypair()
+    monkeypatch.setattr(server, "USE_ASYMMETRIC", True)
+    monkeypatch.setattr(server, "MCP_PUBLIC_KEY", public_key)
+    return private_key
+
+
+@pytest.fixture
+def client():
+    return TestClient(server.app)
+
+
+def send(ws, private_key, msg_type, payload, rid):
+    """Send a signed request tagged with rid."""
+    message = sign_message(private_key, msg_type, payload)
+    message["rid"] = rid
+    ws.send_text(json.dumps(message))
+
+
+def receive(ws):
+    """Receive one response; the server sends JSON in binary frames."""
+    return json.loads(ws.receive_bytes())
+
+
+def upload_chunks(ws, private_key, path, data, rid=1, size=None, chunk_size=4):
+    """Begin an upload of data to path and send it in chunks."""
+    size = len(data) if size is None else size
+    send(ws, private_key, MessageType.UPLOAD_BEGIN,
+         UploadBeginRequest(remote_path=str(path), size=size).to_payload(), rid)
+    offsets = list(range(0, len(data), chunk_size)) or [0]
+    for offset in offsets:
+        chunk = UploadChunk(
+            offset=offset,
+            data=data[offset:offset + chunk_size],
+            eof=offset == offsets[-1],
+        )
+        send(ws, private_key, MessageType.UPLOAD_CHUNK, chunk.to_payload(), rid)
+    return receive(ws)
+
+
+def leftover_temp_files(directory):
+    return [p.name for p in directory.iterdir() if p.name.endswith(".part")]
+
+
+class TestChunkedUpload:
+    """Tests for UPLOAD_BEGIN / UPLOAD_CHUNK handling."""
+
+    def test_full_upload(self, client, private_key, tmp_path):
+        target = tmp_path / "sub" / "file.bin"
+        data = bytes(range(256)) * 3
+
+        with client.websocket_connect("/ws") as ws:
+            response = upload_chunks(ws, private_key, target, data)
+
+        assert response["type"] == MessageType.RESPONSE
+        assert response["payload"]["success"] is True
+        assert response["payload"]["bytes_written"] == len(data)
+        assert response["rid"] == 1
+        assert target.read_bytes() == data
+        assert leftover_temp_files(target.parent) == []
+
+    def test_full_upload_replaces_existing_file(self, client, private_key, tmp_path):
+        target = tmp_path / "file.txt"
+        target.write_bytes(b"old contents")
+
+        with client.websocket_connect("/ws") as ws:
+            response = upload_chunks(ws, private_key, target, b"new contents!")
+
+        assert response["payload"]["success"] is True
+        assert target.read_bytes() == b"new contents!"
+        assert leftover_temp_files(tmp_path) == []
+
+    def test_out_of_order_offset(self, client, private_key, tmp_path):
+        target = tmp_path / "file.txt"
+        target.write_bytes(b"original")
+
+        with client.websocket_connect("/ws") as ws:
+            send(ws, private_key, MessageType.UPLOAD_BEGIN,
+                 UploadBeginRequest(remote_path=str(target), size=8).to_payload(), 1)
+            send(ws, private_key, MessageType.UPLOAD_CHUNK,
+                 UploadChunk(offset=4, data=b"abcd").to_payload(), 1)
+            response = receive(ws)
+
+        assert response["type"] == MessageType.ERROR
+        assert "expected offset 0" in response["payload"]["error"]
+        assert target.read_bytes() == b"original"
+        assert leftover_temp_files(tmp_path) == []
+
+    def test_short_upload(self, client, private_key, tmp_path):
+        target = tmp_path / "file.txt"
+        target.write_bytes(b"original")
+
+        with client.websocket_connect("/ws") as ws:
+            response = upload_chunks(ws, private_key, target, b"short", size=100)
+
+        assert response["type"] == MessageType.ERROR
+        assert "got 5 of 100 bytes" in response["payload"]["error"]
+        assert target.read_bytes() == b"original"
+        assert leftover_temp_files(tmp_path) == []
+
+    def test_disconnect_mid_upload_keeps_original(self, client, private_key, tmp_path):
+        target = tmp_path / "file.txt"
+        target.write_bytes(b"original")
+
+        with client.websocket_connect("/ws") as ws:
+            send(ws, private_key, MessageType.UPLOAD_BEGIN,
+                 UploadBeginRequest(remote_path=str(target), size=8).to_payload(), 1)
+            send(ws, private_key, MessageType.UPLOAD_CHUNK,
+                 UploadChunk(offset=0, data=b"new!").to_payload(), 1)
+            # Requests are handled in order, so the pong means the chunk landed
+            send(ws, private_key, MessageType.PING, {}, 2)
+            assert receive(ws)["type"] == MessageType.PONG
+
+            assert target.read_bytes() == b"original"
+            assert len(leftover_temp_files(tmp_path)) == 1
+
+        assert target.read_bytes() == b"original"
+        assert leftover_temp_files(tmp_path) == []
+
+
+class TestChunkedDownload:
+    """Tests for DOWNLOAD with chunk_size set."""
+
+    def test_download_in_chunks(self, client, private_key, tmp_path):
+        source = tmp_path / "file.bin"
+        data = bytes(range(256)) * 4
+        source.write_bytes(data)
+
+        with client.websocket_connect("/ws") as ws:
+            send(ws, private_key, MessageType.DOWNLOAD,
+                 DownloadRequest(remote_path=str(source), chunk_size=300).to_payload(), 1)
+            chunks = []
+            while True:
+                message = receive(ws)
+                assert message["type"] == MessageType.DOWNLOAD_CHUNK
+                assert message["rid"] == 1
+                chunks.append(DownloadChunk.from_payload(message["payload"]))
+                if chunks[-1].eof:
+                    break
+
+        assert [c.offset for c in chunks] == [0, 300, 600, 900]
+        assert b"".join(c.data for c in chunks) == data
+
+    def test_download_missing_file(self, client, private_key, tmp_path):
+        with client.websocket_connect("/ws") as ws:
+            send(ws, private_key, MessageType.DOWNLOAD,
+                 DownloadRequest(remote_path=str(tmp_path / "nope"), chunk_size=300).to_payload(), 1)
+            response = receive(ws)
+
+        assert response["type"] == MessageType.ERROR
+        assert response["payload"]["code"] == "FILE_NOT_FOUND"
+
+
+class TestMalformedFrames:
+    """Frames that can't be decoded get an error, not a dropped connection."""
+
+    @pytest.mark.parametrize("has_orjson", sorted({False, serialization.HAS_ORJSON}))
+    @pytest.mark.parametrize("frame", [b"not json", b'{"type":"\xff"}'])
+    def test_parse_error_keeps_connection(self, client, private_key, frame, has_orjson,
+                                          monkeypatch):
+        monkeypatch.setattr(serialization, "HAS_ORJSON", has_orjson)
+
+        with client.websocket_connect("/ws") as ws:
+            ws.send_bytes(frame)
+            response = receive(ws)
+            send(ws, private_key, MessageType.PING, {}, 1)
+            pong = receive(ws)
+
+        assert response["type"] == MessageType.ERROR
+        assert response["payload"]["code"] == "PARSE_ERROR"
+        assert pong["type"] == MessageType.PONG
@@ -15,7 +15,7 @@ import json
 import time
 import uuid
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from nacl.signing import SigningKey, VerifyKey
 from nacl.encoding import HexEncoder, RawEncoder
@@ -250,6 +250,111 @@ def sign_message(private_key: SigningKey, msg_type: str, payload: Dict[str, Any]
     }
 
 
+def sign_message_frame(
+    private_key: SigningKey,
+    msg_type: str,
+    payload: Dict[str, Any],
+    rid: Optional[int] = None
+) -> bytes:
+    """Create a signed message already encoded as compact UTF-8 JSON bytes.
+
+    Decodes to the same message sign_message() returns (plus "rid" when
+    given). The payload's canonical JSON is encoded to bytes once; the
+    same bytes are signed and spliced into the envelope, which is joined
+    in a single allocation instead of being rebuilt as a dict and
+    serialized again.
+
+    Args:
+        private_key: Ed25519 signing key
+        msg_type: Message type
+        payload: Message payload
+        rid: Request correlation id to include, outside the signature
+
+    Returns:
+        Encoded frame, ready to send as a binary WebSocket frame
+    """
+    type_value = msg_type.value if hasattr(msg_type, 'value') else msg_type
+    timestamp = get_timestamp()
+    nonce = generate_nonce()
+    # ensure_ascii (the default) makes the canonical JSON pure ASCII
+    payload_bytes = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('ascii')
+    prefix = f"{type_value}:{timestamp}:{nonce}:".encode('utf-8')
+    signature = private_key.sign(prefix + payload_bytes).signature.hex()
+
+    parts = [
+        b'{"type":', json.dumps(type_value).encode('ascii'),
+        b',"payload":', payload_bytes,
+        b',"timestamp":%d,"nonce":"%s","signature":"%s"' % (
+            timestamp, nonce.encode('ascii'), signature.encode('ascii')
+        ),
+    ]
+    if rid is not None:
+        parts.append(b',"rid":%d' % rid)
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+def sign_message_text(
+    private_key: SigningKey,
+    msg_type: str,
+    payload: Dict[str, Any],
+    rid: Optional[int] = None
+) -> str:
+    """Create a signed message already encoded as compact JSON text.
+
+    Text-frame counterpart of sign_message_frame().
+
+    Args:
+        private_key: Ed25519 signing key
+        msg_type: Message type
+        payload: Message payload
+        rid: Request correlation id to include, outside the signature
+
+    Returns:
+        JSON text, ready to send as a WebSocket frame
+    """
+    return sign_message_frame(private_key, msg_type, payload, rid).decode('ascii')
+
+
+def sign_messages_batch(
+    private_key: SigningKey,
+    msg_type: str,
+    payloads: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Create signed messages for several payloads of the same type.
+
+    The timestamp and message type prefix are computed once and shared by
+    the whole batch; each message still gets its own nonce and signature,
+    so every message verifies independently with verify_message().
+
+    Args:
+        private_key: Ed25519 signing key
+        msg_type: Message type shared by all payloads
+        payloads: Message payloads, in send order
+
+    Returns:
+        List of complete signed message dicts, in the same order as payloads
+    """
+    timestamp = get_timestamp()
+    type_value = msg_type.value if hasattr(msg_type, 'value') else msg_type
+    prefix = f"{type_value}:{timestamp}:"
+    sign = private_key.sign
+
+    messages = []
+    for payload in payloads:
+        nonce = generate_nonce()
+        payload_str = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        canonical = f"{prefix}{nonce}:{payload_str}".encode('utf-8')
+        messages.append({
+            "type": msg_type,
+            "payload": payload,
+            "timestamp": timestamp,
+            "nonce": nonce,
+            "signature": sign(canonical).signature.hex()
+        })
+    return messages
+
+
 def verify_message(public_key: VerifyKey, message: Dict[str, Any], check_timestamp: bool = True) -> Tuple[bool, Optional[str]]:
     """Verify a received message.
 
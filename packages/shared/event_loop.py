@@ -0,0 +1,48 @@
+"""Event loop creation for nlsh components.
+
+uvloop runs socket reads and timers on libuv, which speeds up
+receive-heavy loops such as downloads and script output streaming. It is
+opt-in: set NLSH_USE_UVLOOP=1 with uvloop installed; otherwise the stdlib
+asyncio loop is used.
+"""
+
+import asyncio
+import os
+
+
+def enabled_uvloop():
+    """Return the uvloop module if NLSH_USE_UVLOOP=1 and it is installed, else None."""
+    if os.getenv("NLSH_USE_UVLOOP", "0") != "1":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop
+
+
+def install_uvloop() -> bool:
+    """Switch asyncio to uvloop when NLSH_USE_UVLOOP=1 and uvloop is installed.
+
+    Must be called before the event loop is created.
+
+    Returns:
+        True if uvloop was installed
+    """
+    uvloop = enabled_uvloop()
+    if uvloop is None:
+        return False
+    uvloop.install()
+    return True
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, on uvloop when NLSH_USE_UVLOOP=1 and it is installed.
+
+    Unlike install_uvloop(), only the returned loop is affected; the
+    global event loop policy is left alone.
+    """
+    uvloop = enabled_uvloop()
+    if uvloop is None:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
@@ -4,13 +4,22 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import Any
 import base64
+import hashlib
+import zlib
+
+
+# zlib level for compressed transfer chunks: fast, and most of the gain
+CHUNK_COMPRESS_LEVEL = 1
 
 
 class MessageType(str, Enum):
     """Types of messages in the nlsh protocol."""
     COMMAND = "command"      # Execute a shell command
     UPLOAD = "upload"        # Upload a file to remote
+    UPLOAD_BEGIN = "upload_begin"      # Start a chunked upload
+    UPLOAD_CHUNK = "upload_chunk"      # One piece of a chunked upload
     DOWNLOAD = "download"    # Download a file from remote
+    DOWNLOAD_CHUNK = "download_chunk"  # One piece of a streamed download
     RESPONSE = "response"    # Response to any request
     ERROR = "error"          # Error response
     PING = "ping"            # Keepalive ping
@@ -20,6 +29,8 @@ class MessageType(str, Enum):
     CACHE_STORE_EXEC = "cache_store_exec"  # Store command and execute
     CACHE_HIT = "cache_hit"                # Lookup found the key
     CACHE_MISS = "cache_miss"              # Lookup did not find key
+    CACHE_LOOKUP_BATCH = "cache_lookup_batch"  # Look up many keys at once
+    CACHE_BATCH_RESULT = "cache_batch_result"  # Hit/miss for each batch key
     # Script execution messages
     SCRIPT = "script"                      # Execute a multi-line script
     SCRIPT_OUTPUT = "script_output"        # Streaming output chunk
@@ -36,7 +47,7 @@ class MessageType(str, Enum):
     PUSH_RESOURCE_ALERT = "push_resource_alert"    # Resource warnings (disk full, etc.)
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandRequest:
     """Request to execute a shell command."""
     command: str
@@ -59,7 +70,7 @@ class CommandRequest:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandResponse:
     """Response from command execution."""
     stdout: str
@@ -85,7 +96,7 @@ class CommandResponse:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class UploadRequest:
     """Request to upload a file."""
     remote_path: str
@@ -108,7 +119,108 @@ class UploadRequest:
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class UploadBeginRequest:
+    """Start of a chunked upload.
+
+    The file follows as UploadChunk messages carrying the same request_id;
+    the server answers once, with an UploadResponse after the eof chunk
+    (or an error as soon as something fails).
+    """
+    remote_path: str
+    size: int
+    mode: str = "0644"
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "remote_path": self.remote_path,
+            "size": self.size,
+            "mode": self.mode
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "UploadBeginRequest":
+        return cls(
+            remote_path=payload["remote_path"],
+            size=payload["size"],
+            mode=payload.get("mode", "0644")
+        )
+
+
+def _compress_body(header: dict[str, Any], data: bytes) -> bytes:
+    """zlib-compress a chunk body if that makes it smaller, flagging header."""
+    packed = zlib.compress(data, CHUNK_COMPRESS_LEVEL)
+    if len(packed) >= len(data):
+        return data
+    header["compressed"] = True
+    return packed
+
+
+@dataclass(slots=True)
+class UploadChunk:
+    """One piece of a chunked upload."""
+    offset: int
+    data: bytes
+    eof: bool = False
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "offset": self.offset,
+            "data": base64.b64encode(self.data).decode('utf-8'),
+            "eof": self.eof
+        }
+
+    def to_header_payload(self) -> dict[str, Any]:
+        """Payload for a binary frame; the data travels as the frame body.
+
+        The body is outside the signature, so the signed header carries
+        its SHA-256 digest.
+        """
+        return {
+            "offset": self.offset,
+            "eof": self.eof,
+            "sha256": hashlib.sha256(self.data).hexdigest()
+        }
+
+    def to_header_and_body(self, compress: bool = False) -> tuple[dict[str, Any], bytes]:
+        """Header payload and body for a binary frame.
+
+        With compress set, the body is zlib-compressed when that makes it
+        smaller and the header is flagged; the digest is always of the
+        uncompressed data.
+        """
+        header = self.to_header_payload()
+        if not compress:
+            return header, self.data
+        return header, _compress_body(header, self.data)
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "UploadChunk":
+        return cls(
+            offset=payload["offset"],
+            data=base64.b64decode(payload["data"]),
+            eof=payload.get("eof", False)
+        )
+
+    @classmethod
+    def from_header_payload(cls, payload: dict[str, Any], data: bytes) -> "UploadChunk":
+        """Build a chunk from a binary frame's header and body.
+
+        Raises:
+            ValueError: If the body doesn't match the header's digest
+        """
+        if payload.get("compressed"):
+            data = zlib.decompress(data)
+        if hashlib.sha256(data).hexdigest() != payload["sha256"]:
+            raise ValueError("chunk data does not match its sha256")
+        return cls(
+            offset=payload["offset"],
+            data=data,
+            eof=payload.get("eof", False)
+        )
+
+
+@dataclass(slots=True)
 class UploadResponse:
     """Response from file upload."""
     success: bool
@@ -131,22 +243,41 @@ class UploadResponse:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadRequest:
-    """Request to download a file."""
+    """Request to download a file.
+
+    A non-zero chunk_size asks the server to stream the file as
+    DownloadChunk messages instead of one DownloadResponse. With binary
+    set, each chunk is sent as a binary frame carrying the raw bytes after
+    its header (see shared.serialization.encode_frame_with_body) rather
+    than base64 text. compress additionally lets the server zlib-compress
+    binary chunk bodies that shrink.
+    """
     remote_path: str
+    chunk_size: int = 0
+    binary: bool = False
+    compress: bool = False
 
     def to_payload(self) -> dict[str, Any]:
         return {
-            "remote_path": self.remote_path
+            "remote_path": self.remote_path,
+            "chunk_size": self.chunk_size,
+            "binary": self.binary,
+            "compress": self.compress
         }
 
     @classmethod
     def from_payload(cls, payload: dict[str, Any]) -> "DownloadRequest":
-        return cls(remote_path=payload["remote_path"])
+        return cls(
+            remote_path=payload["remote_path"],
+            chunk_size=payload.get("chunk_size", 0),
+            binary=payload.get("binary", False),
+            compress=payload.get("compress", False)
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadResponse:
     """Response from file download."""
     success: bool
@@ -175,7 +306,54 @@ class DownloadResponse:
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class DownloadChunk:
+    """One piece of a streamed file download."""
+    offset: int
+    data: bytes
+    eof: bool = False
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "offset": self.offset,
+            "data": base64.b64encode(self.data).decode('utf-8'),
+            "eof": self.eof
+        }
+
+    def to_header_payload(self) -> dict[str, Any]:
+        """Payload for a binary frame; the data travels as the frame body."""
+        return {
+            "offset": self.offset,
+            "eof": self.eof
+        }
+
+    def to_header_and_body(self, compress: bool = False) -> tuple[dict[str, Any], bytes]:
+        """Header payload and body for a binary frame, optionally compressed."""
+        header = self.to_header_payload()
+        if not compress:
+            return header, self.data
+        return header, _compress_body(header, self.data)
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "DownloadChunk":
+        return cls(
+            offset=payload["offset"],
+            data=base64.b64decode(payload["data"]),
+            eof=payload.get("eof", False)
+        )
+
+    @classmethod
+    def from_header_payload(cls, payload: dict[str, Any], data: bytes) -> "DownloadChunk":
+        if payload.get("compressed"):
+            data = zlib.decompress(data)
+        return cls(
+            offset=payload["offset"],
+            data=data,
+            eof=payload.get("eof", False)
+        )
+
+
+@dataclass(slots=True)
 class ErrorResponse:
     """Error response."""
     error: str
@@ -199,7 +377,7 @@ class ErrorResponse:
 # Cache Protocol Messages
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class CacheLookupRequest:
     """Request to look up a cached command by key."""
     key: str  # UUID
@@ -212,7 +390,7 @@ class CacheLookupRequest:
         return cls(key=payload["key"])
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheLookupResponse:
     """Response to cache lookup - either hit with command or miss."""
     hit: bool
@@ -235,7 +413,35 @@ class CacheLookupResponse:
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class CacheLookupBatchRequest:
+    """Request to look up several cached commands in one message."""
+    keys: list[str]
+
+    def to_payload(self) -> dict[str, Any]:
+        return {"keys": self.keys}
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "CacheLookupBatchRequest":
+        return cls(keys=list(payload["keys"]))
+
+
+@dataclass(slots=True)
+class CacheLookupBatchResponse:
+    """Response to a batch lookup - one result per requested key, in order."""
+    results: list[CacheLookupResponse]
+
+    def to_payload(self) -> dict[str, Any]:
+        return {"results": [result.to_payload() for result in self.results]}
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "CacheLookupBatchResponse":
+        return cls(
+            results=[CacheLookupResponse.from_payload(r) for r in payload["results"]]
+        )
+
+
+@dataclass(slots=True)
 class CacheStoreExecRequest:
     """Request to store a command and execute it."""
     key: str  # UUID
@@ -265,7 +471,7 @@ class CacheStoreExecRequest:
 # Script Execution Protocol Messages
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ScriptRequest:
     """Request to execute a shell script."""
     script_id: str                    # UUID for tracking/cancellation
@@ -297,7 +503,7 @@ class ScriptRequest:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptOutputChunk:
     """A chunk of streaming output from script execution."""
     script_id: str
@@ -323,7 +529,7 @@ class ScriptOutputChunk:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptCompleteResponse:
     """Final response when script execution completes."""
     script_id: str
@@ -358,7 +564,7 @@ class ScriptCompleteResponse:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptCancelRequest:
     """Request to cancel a running script."""
     script_id: str
@@ -378,7 +584,7 @@ class ScriptCancelRequest:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptCancelledResponse:
     """Confirmation that script was cancelled."""
     script_id: str
@@ -408,7 +614,7 @@ class ScriptCancelledResponse:
 # Server-Push Protocol Messages (Full Duplex)
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class PushTaskStatus:
     """Status update for a background task."""
     task_id: str
@@ -434,7 +640,7 @@ class PushTaskStatus:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PushJobComplete:
     """Notification that an async job has finished."""
     job_id: str
@@ -460,7 +666,7 @@ class PushJobComplete:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PushPrompt:
     """Server-initiated prompt requiring user response."""
     prompt_id: str
@@ -489,7 +695,7 @@ class PushPrompt:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PushNotification:
     """General notification from server."""
     notification_id: str
@@ -518,7 +724,7 @@ class PushNotification:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PushHeartbeat:
     """Server health/status broadcast."""
     server_time: float          # Unix timestamp
@@ -544,7 +750,7 @@ class PushHeartbeat:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PushScriptProgress:
     """Progress update for long-running scripts."""
     script_id: str
@@ -573,7 +779,7 @@ class PushScriptProgress:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PushResourceAlert:
     """Resource warning (disk full, memory low, etc.)."""
     alert_id: str
@@ -0,0 +1,137 @@
+"""Wire encoding for nlsh protocol messages.
+
+Messages travel as UTF-8 JSON in WebSocket frames. When orjson is installed
+it does the encoding and decoding; otherwise a stdlib encoder and decoder
+created once at import time are reused for every frame. Both produce the
+same compact JSON, so peers don't need to agree on which one they use.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Compact separators: no whitespace on the wire
+_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+_decoder = json.JSONDecoder()
+
+# Encoded messages start with the type field (dicts keep insertion order)
+_TYPE_PREFIX = '{"type":"'
+_TYPE_PREFIX_BYTES = _TYPE_PREFIX.encode('utf-8')
+
+
+def encode_message(message: dict[str, Any] | list[dict[str, Any]]) -> str:
+    """Encode a message dict as compact JSON text.
+
+    Args:
+        message: Message dict (signed request or response), or a list of
+            them to send as one batched frame
+
+    Returns:
+        JSON text, ready to send as a text WebSocket frame
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(message).decode('utf-8')
+    return _encoder.encode(message)
+
+
+def encode_frame(message: dict[str, Any]) -> bytes:
+    """Encode a message dict as compact UTF-8 JSON bytes.
+
+    Args:
+        message: Message dict (signed request or response)
+
+    Returns:
+        Encoded frame, ready to send as a binary WebSocket frame
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(message)
+    return _encoder.encode(message).encode('utf-8')
+
+
+def encode_frame_with_body(message: dict[str, Any], body: bytes) -> bytes:
+    """Encode a message header followed by a raw binary body in one frame.
+
+    Compact JSON never contains a literal newline, so a single b"\\n"
+    unambiguously separates the header from the body. This carries file
+    data without base64 inflation or JSON string escaping.
+
+    Args:
+        message: Message dict (the header)
+        body: Raw bytes to append
+
+    Returns:
+        Encoded frame, to send as a binary WebSocket frame
+    """
+    return encode_frame(message) + b"\n" + body
+
+
+def decode_frame(data: bytes | str) -> tuple[dict[str, Any], memoryview | None]:
+    """Decode a received frame that may carry a raw binary body.
+
+    Args:
+        data: Frame contents (binary or text frame)
+
+    Returns:
+        Tuple of (message dict, body). body is None for plain messages and
+        a zero-copy view into the frame for encode_frame_with_body() frames.
+    """
+    if isinstance(data, str):
+        return decode_message(data), None
+    separator = data.find(b"\n")
+    if separator == -1:
+        return decode_message(data), None
+    return decode_message(data[:separator]), memoryview(data)[separator + 1:]
+
+
+def decode_message(data: bytes | str) -> dict[str, Any]:
+    """Decode a received frame into a message dict.
+
+    Args:
+        data: Frame contents (binary or text frame)
+
+    Returns:
+        Decoded message dict
+
+    Raises:
+        json.JSONDecodeError: If the frame is not valid JSON
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        try:
+            data = bytes(data).decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise json.JSONDecodeError(f"Invalid UTF-8: {e.reason}", "", e.start) from e
+    return _decoder.decode(data)
+
+
+def peek_type(data: bytes | str) -> str | None:
+    """Read a frame's message type without parsing the whole frame.
+
+    Works for frames produced by encode_message() from dicts whose first
+    key is "type", which is how every protocol message is built.
+
+    Args:
+        data: Frame contents (binary or text frame)
+
+    Returns:
+        The message type, or None if the frame doesn't start with it
+        (callers should then fall back to decode_message()).
+    """
+    if isinstance(data, str):
+        if not data.startswith(_TYPE_PREFIX):
+            return None
+        end = data.find('"', len(_TYPE_PREFIX))
+        return data[len(_TYPE_PREFIX):end] if end != -1 else None
+
+    if not data.startswith(_TYPE_PREFIX_BYTES):
+        return None
+    end = data.find(b'"', len(_TYPE_PREFIX_BYTES))
+    if end == -1:
+        return None
+    return data[len(_TYPE_PREFIX_BYTES):end].decode('utf-8')
@@ -1,5 +1,6 @@
 """Unit tests for Ed25519 asymmetric crypto module."""
 
+import json
 import pytest
 import time
 from pathlib import Path
@@ -15,6 +16,9 @@ from asymmetric_crypto import (
     create_signature,
     verify_signature,
     sign_message,
+    sign_messages_batch,
+    sign_message_frame,
+    sign_message_text,
     verify_message,
     re_sign_message,
     get_public_key_hex,
@@ -442,6 +446,94 @@ class TestSignMessage:
         assert msg["payload"] == payload
 
 
+class TestSignMessageText:
+    """Tests for sign_message_text function."""
+
+    def test_decodes_to_signed_message(self):
+        """Encoded message should have the sign_message() fields and verify."""
+        private_key, public_key = generate_keypair()
+        payload = {"command": "echo \"héllo\"", "cwd": None, "timeout": 30}
+
+        msg = json.loads(sign_message_text(private_key, "command", payload))
+
+        assert set(msg) == {"type", "payload", "timestamp", "nonce", "signature"}
+        assert msg["type"] == "command"
+        assert msg["payload"] == payload
+        is_valid, error = verify_message(public_key, msg)
+        assert is_valid is True
+        assert error is None
+
+    def test_rid_outside_signature(self):
+        """rid should be included without breaking verification."""
+        private_key, public_key = generate_keypair()
+
+        msg = json.loads(sign_message_text(private_key, "ping", {}, rid=7))
+
+        assert msg["rid"] == 7
+        is_valid, error = verify_message(public_key, msg)
+        assert is_valid is True
+
+
+class TestSignMessageFrame:
+    """Tests for sign_message_frame function."""
+
+    def test_bytes_decode_to_signed_message(self):
+        """Frame bytes should decode to a message that verifies."""
+        private_key, public_key = generate_keypair()
+        payload = {"path": "/tmp/ünïcode", "mode": "0644"}
+
+        frame = sign_message_frame(private_key, "upload", payload, rid=3)
+
+        assert isinstance(frame, bytes)
+        msg = json.loads(frame)
+        assert msg["payload"] == payload
+        assert msg["rid"] == 3
+        is_valid, error = verify_message(public_key, msg)
+        assert is_valid is True
+        assert error is None
+
+
+class TestSignMessagesBatch:
+    """Tests for sign_messages_batch function."""
+
+    def test_batch_preserves_order_and_payloads(self):
+        """Messages should come back in payload order."""
+        private_key, _ = generate_keypair()
+        payloads = [{"key": "a"}, {"key": "b"}, {"key": "c"}]
+
+        msgs = sign_messages_batch(private_key, "cache_lookup", payloads)
+
+        assert [m["payload"] for m in msgs] == payloads
+        assert all(m["type"] == "cache_lookup" for m in msgs)
+
+    def test_batch_messages_verify_independently(self):
+        """Each batch message should verify on its own."""
+        private_key, public_key = generate_keypair()
+
+        msgs = sign_messages_batch(
+            private_key, "cache_lookup", [{"key": str(i)} for i in range(5)]
+        )
+
+        for msg in msgs:
+            is_valid, error = verify_message(public_key, msg)
+            assert is_valid is True
+            assert error is None
+
+    def test_batch_nonces_unique(self):
+        """Each batch message should get its own nonce."""
+        private_key, _ = generate_keypair()
+
+        msgs = sign_messages_batch(private_key, "ping", [{}, {}, {}])
+
+        assert len({m["nonce"] for m in msgs}) == 3
+
+    def test_batch_empty(self):
+        """Empty payload list should yield no messages."""
+        private_key, _ = generate_keypair()
+
+        assert sign_messages_batch(private_key, "ping", []) == []
+
+
 class TestVerifyMessage:
     """Tests for high-level verify_message function."""
 
@@ -0,0 +1,66 @@
+"""Unit tests for shared event_loop module."""
+
+import asyncio
+import sys
+import types
+
+import pytest
+from event_loop import enabled_uvloop, install_uvloop, new_event_loop
+
+
+@pytest.fixture
+def fake_uvloop(monkeypatch):
+    """Install a stand-in uvloop module that records its calls."""
+    calls = []
+    module = types.ModuleType("uvloop")
+    module.install = lambda: calls.append("install")
+
+    def fake_new_event_loop():
+        calls.append("new_event_loop")
+        return asyncio.new_event_loop()
+
+    module.new_event_loop = fake_new_event_loop
+    monkeypatch.setitem(sys.modules, "uvloop", module)
+    return calls
+
+
+class TestEnabledUvloop:
+    """Tests for the NLSH_USE_UVLOOP switch."""
+
+    def test_off_by_default(self, monkeypatch, fake_uvloop):
+        monkeypatch.delenv("NLSH_USE_UVLOOP", raising=False)
+        assert enabled_uvloop() is None
+
+    def test_on_when_set(self, monkeypatch, fake_uvloop):
+        monkeypatch.setenv("NLSH_USE_UVLOOP", "1")
+        assert enabled_uvloop() is sys.modules["uvloop"]
+
+    def test_missing_uvloop(self, monkeypatch):
+        monkeypatch.setenv("NLSH_USE_UVLOOP", "1")
+        monkeypatch.setitem(sys.modules, "uvloop", None)  # import raises ImportError
+        assert enabled_uvloop() is None
+        assert install_uvloop() is False
+
+
+class TestNewEventLoop:
+    """Tests for new_event_loop and install_uvloop."""
+
+    def test_stdlib_loop_when_off(self, monkeypatch, fake_uvloop):
+        monkeypatch.setenv("NLSH_USE_UVLOOP", "0")
+        loop = new_event_loop()
+        try:
+            assert isinstance(loop, asyncio.AbstractEventLoop)
+            assert fake_uvloop == []
+        finally:
+            loop.close()
+
+    def test_uvloop_when_on(self, monkeypatch, fake_uvloop):
+        monkeypatch.setenv("NLSH_USE_UVLOOP", "1")
+        loop = new_event_loop()
+        loop.close()
+        assert fake_uvloop == ["new_event_loop"]
+
+    def test_install(self, monkeypatch, fake_uvloop):
+        monkeypatch.setenv("NLSH_USE_UVLOOP", "1")
+        assert install_uvloop() is True
+        assert fake_uvloop == ["install"]
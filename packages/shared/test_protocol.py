@@ -2,12 +2,15 @@
 
 import pytest
 import base64
+import os
 from protocol import (
     MessageType,
     CommandRequest, CommandResponse,
-    UploadRequest, UploadResponse,
-    DownloadRequest, DownloadResponse,
-    ErrorResponse
+    UploadRequest, UploadResponse, UploadBeginRequest, UploadChunk,
+    DownloadRequest, DownloadResponse, DownloadChunk,
+    ErrorResponse,
+    CacheLookupResponse,
+    CacheLookupBatchRequest, CacheLookupBatchResponse,
 )
 
 
@@ -130,6 +133,67 @@ class TestUploadRequest:
         assert restored.data == test_data
 
 
+class TestUploadBeginRequest:
+    """Tests for UploadBeginRequest."""
+
+    def test_roundtrip(self):
+        req = UploadBeginRequest(remote_path="/tmp/big.bin", size=5_000_000, mode="0600")
+        restored = UploadBeginRequest.from_payload(req.to_payload())
+
+        assert restored == req
+
+    def test_default_mode(self):
+        req = UploadBeginRequest.from_payload({"remote_path": "/tmp/x", "size": 1})
+
+        assert req.mode == "0644"
+
+
+class TestUploadChunk:
+    """Tests for UploadChunk."""
+
+    def test_to_payload(self):
+        chunk = UploadChunk(offset=65536, data=b"\x00\xff binary")
+        payload = chunk.to_payload()
+
+        assert payload["offset"] == 65536
+        assert payload["eof"] is False
+        assert base64.b64decode(payload["data"]) == b"\x00\xff binary"
+
+    def test_roundtrip(self):
+        chunk = UploadChunk(offset=0, data=b"last part", eof=True)
+
+        assert UploadChunk.from_payload(chunk.to_payload()) == chunk
+
+    def test_header_payload_has_digest_not_data(self):
+        chunk = UploadChunk(offset=4, data=b"\x00raw", eof=True)
+        payload = chunk.to_header_payload()
+
+        assert "data" not in payload
+        assert payload["offset"] == 4
+        assert UploadChunk.from_header_payload(payload, b"\x00raw") == chunk
+
+    def test_header_payload_rejects_tampered_body(self):
+        payload = UploadChunk(offset=0, data=b"original").to_header_payload()
+
+        with pytest.raises(ValueError):
+            UploadChunk.from_header_payload(payload, b"tampered")
+
+    def test_compressed_body_roundtrip(self):
+        chunk = UploadChunk(offset=0, data=b"abc" * 1000, eof=True)
+        header, body = chunk.to_header_and_body(compress=True)
+
+        assert header["compressed"] is True
+        assert len(body) < len(chunk.data)
+        assert UploadChunk.from_header_payload(header, body) == chunk
+
+    def test_incompressible_body_sent_as_is(self):
+        chunk = UploadChunk(offset=0, data=os.urandom(512))
+        header, body = chunk.to_header_and_body(compress=True)
+
+        assert "compressed" not in header
+        assert body == chunk.data
+
+
 class TestUploadResponse:
     """Tests for UploadResponse."""
 
@@ -171,6 +235,16 @@ class TestDownloadRequest:
         req = DownloadRequest.from_payload(payload)
 
         assert req.remote_path == "/var/log/syslog"
+        assert req.chunk_size == 0
+        assert req.binary is False
+
+    def test_chunk_size_roundtrip(self):
+        req = DownloadRequest(remote_path="/tmp/big.bin", chunk_size=65536, binary=True)
+        restored = DownloadRequest.from_payload(req.to_payload())
+
+        assert restored.chunk_size == 65536
+        assert restored.binary is True
+        assert restored.compress is False
 
 
 class TestDownloadResponse:
@@ -228,6 +302,46 @@ class TestDownloadResponse:
         assert resp.data is None
 
 
+class TestDownloadChunk:
+    """Tests for DownloadChunk."""
+
+    def test_to_payload(self):
+        chunk = DownloadChunk(offset=1024, data=b"\x00\xff binary", eof=True)
+        payload = chunk.to_payload()
+
+        assert payload["offset"] == 1024
+        assert payload["eof"] is True
+        assert base64.b64decode(payload["data"]) == b"\x00\xff binary"
+
+    def test_roundtrip(self):
+        chunk = DownloadChunk(offset=0, data=b"part one")
+        restored = DownloadChunk.from_payload(chunk.to_payload())
+
+        assert restored == chunk
+        assert restored.eof is False
+
+    def test_empty_final_chunk(self):
+        chunk = DownloadChunk(offset=42, data=b"", eof=True)
+        restored = DownloadChunk.from_payload(chunk.to_payload())
+
+        assert restored.data == b""
+        assert restored.eof is True
+
+    def test_header_payload_has_no_data(self):
+        chunk = DownloadChunk(offset=8, data=b"raw", eof=True)
+        payload = chunk.to_header_payload()
+
+        assert payload == {"offset": 8, "eof": True}
+        assert DownloadChunk.from_header_payload(payload, b"raw") == chunk
+
+    def test_compressed_body_roundtrip(self):
+        chunk = DownloadChunk(offset=16, data=b"line\n" * 500)
+        header, body = chunk.to_header_and_body(compress=True)
+
+        assert header["compressed"] is True
+        assert DownloadChunk.from_header_payload(header, body) == chunk
+
+
 class TestErrorResponse:
     """Tests for ErrorResponse."""
 
@@ -252,3 +366,30 @@ class TestErrorResponse:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestCacheLookupBatch:
+    """Tests for CacheLookupBatchRequest and CacheLookupBatchResponse."""
+
+    def test_request_roundtrip(self):
+        req = CacheLookupBatchRequest(keys=["k1", "k2", "k3"])
+        restored = CacheLookupBatchRequest.from_payload(req.to_payload())
+
+        assert restored.keys == ["k1", "k2", "k3"]
+
+    def test_response_roundtrip(self):
+        resp = CacheLookupBatchResponse(results=[
+            CacheLookupResponse(hit=True, key="k1", command="ls -la"),
+            CacheLookupResponse(hit=False, key="k2"),
+        ])
+        restored = CacheLookupBatchResponse.from_payload(resp.to_payload())
+
+        assert restored.results[0].hit is True
+        assert restored.results[0].command == "ls -la"
+        assert restored.results[1].hit is False
+        assert restored.results[1].command is None
+
+    def test_empty_batch(self):
+        resp = CacheLookupBatchResponse.from_payload({"results": []})
+
+        assert resp.results == []
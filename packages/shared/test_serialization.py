@@ -0,0 +1,157 @@
+"""Unit tests for shared serialization module."""
+
+import json
+
+import pytest
+from protocol import MessageType
+import serialization
+from serialization import (
+    encode_message, encode_frame, encode_frame_with_body,
+    decode_message, decode_frame, peek_type,
+)
+
+
+class TestEncodeMessage:
+    """Tests for encode_message."""
+
+    def test_returns_text(self):
+        assert isinstance(encode_message({"type": "ping"}), str)
+
+    def test_compact_output(self):
+        encoded = encode_message({"type": "ping", "payload": {"status": "ok"}})
+
+        assert encoded == '{"type":"ping","payload":{"status":"ok"}}'
+
+    def test_enum_type_encodes_as_value(self):
+        encoded = encode_message({"type": MessageType.COMMAND})
+
+        assert json.loads(encoded)["type"] == "command"
+
+    def test_unicode(self):
+        encoded = encode_message({"data": "héllo ✓"})
+
+        assert json.loads(encoded)["data"] == "héllo ✓"
+
+
+class TestEncodeFrame:
+    """Tests for encode_frame."""
+
+    def test_returns_bytes(self):
+        assert isinstance(encode_frame({"type": "ping"}), bytes)
+
+    def test_matches_text_encoding(self):
+        message = {"type": "script_output", "payload": {"data": "héllo ✓\n"}}
+
+        assert encode_frame(message) == encode_message(message).encode('utf-8')
+
+
+class TestStdlibFallback:
+    """The stdlib path must produce the same wire format as orjson."""
+
+    @pytest.fixture(autouse=True)
+    def no_orjson(self, monkeypatch):
+        monkeypatch.setattr(serialization, "HAS_ORJSON", False)
+
+    def test_compact_output(self):
+        encoded = encode_message({"type": "ping", "payload": {"data": "✓"}})
+
+        assert encoded == '{"type":"ping","payload":{"data":"✓"}}'
+
+    def test_invalid_utf8_raises_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            decode_message(b'{"data":"\xff"}')
+
+    def test_frame_roundtrip(self):
+        message = {"type": MessageType.PONG, "payload": {"status": "ok"}}
+
+        assert decode_message(encode_frame(message)) == {
+            "type": "pong", "payload": {"status": "ok"}
+        }
+
+
+class TestDecodeMessage:
+    """Tests for decode_message."""
+
+    def test_decode_bytes(self):
+        assert decode_message(b'{"type":"pong"}') == {"type": "pong"}
+
+    def test_decode_text(self):
+        assert decode_message('{"type":"pong"}') == {"type": "pong"}
+
+    def test_decode_encoded_bytes(self):
+        encoded = encode_message({"data": "héllo ✓"}).encode('utf-8')
+
+        assert decode_message(encoded) == {"data": "héllo ✓"}
+
+    def test_roundtrip(self):
+        message = {
+            "type": "command",
+            "payload": {"command": "ls -la", "cwd": None, "timeout": 300},
+            "request_id": "abc",
+        }
+
+        assert decode_message(encode_message(message)) == message
+
+    def test_invalid_json(self):
+        with pytest.raises(json.JSONDecodeError):
+            decode_message(b"not json")
+
+
+class TestBinaryBodyFrames:
+    """Tests for encode_frame_with_body and decode_frame."""
+
+    def test_roundtrip_with_body(self):
+        body = bytes(range(256)) + b"\n\n{\"type\":\"x\"}"
+        frame = encode_frame_with_body({"type": "download_chunk", "payload": {"offset": 0}}, body)
+
+        message, decoded_body = decode_frame(frame)
+
+        assert message == {"type": "download_chunk", "payload": {"offset": 0}}
+        assert bytes(decoded_body) == body
+
+    def test_empty_body(self):
+        message, body = decode_frame(encode_frame_with_body({"type": "x"}, b""))
+
+        assert message == {"type": "x"}
+        assert bytes(body) == b""
+
+    def test_plain_frame_has_no_body(self):
+        message, body = decode_frame(encode_frame({"type": "pong", "payload": {"s": "a\nb"}}))
+
+        assert message == {"type": "pong", "payload": {"s": "a\nb"}}
+        assert body is None
+
+    def test_text_frame_has_no_body(self):
+        message, body = decode_frame('{"type":"pong"}')
+
+        assert message == {"type": "pong"}
+        assert body is None
+
+    def test_peek_type_on_body_frame(self):
+        frame = encode_frame_with_body({"type": "download_chunk"}, b"\x00\x01")
+
+        assert peek_type(frame) == "download_chunk"
+
+
+class TestPeekType:
+    """Tests for peek_type."""
+
+    def test_peek_encoded_message(self):
+        frame = encode_message({"type": "push_notification", "payload": {"x": 1}})
+
+        assert peek_type(frame) == "push_notification"
+        assert peek_type(frame.encode('utf-8')) == "push_notification"
+
+    def test_peek_enum_type(self):
+        frame = encode_message({"type": MessageType.SCRIPT_OUTPUT, "payload": {}})
+
+        assert peek_type(frame) == "script_output"
+
+    def test_type_not_first(self):
+        assert peek_type(b'{"payload":{},"type":"pong"}') is None
+
+    def test_non_compact_json(self):
+        assert peek_type('{"type": "pong"}') is None
+
+    def test_truncated_frame(self):
+        assert peek_type(b'{"type":"pon') is None